@@ -0,0 +1,128 @@
+import argparse
+import importlib
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+
+DAYS_DIRECTORY = Path(__file__).resolve().parent
+DAY_MODULE_PATTERN = re.compile(r"^day(?P<day>\d{2})(?:_part1_only_solved)?\.py$")
+PARTS = ("part_one", "part_two")
+
+
+class Result(NamedTuple):
+    day: int
+    part: str
+    answer: Any
+    seconds: float
+
+
+@dataclass
+class Solver:
+    day: int
+    module_name: str
+    module: Optional[ModuleType] = field(default=None, init=False, repr=False)
+
+    def load(self) -> ModuleType:
+        if self.module is None:
+            self.module = importlib.import_module(self.module_name)
+        return self.module
+
+    def filename(self, data_directory: Optional[Path] = None) -> Optional[str]:
+        filename: Optional[str] = getattr(self.load(), "FILENAME", None)
+        if filename is None or data_directory is None:
+            return filename
+        return str(data_directory / Path(filename).name)
+
+    def parts(self) -> list[str]:
+        # a day module can list its solved parts to leave out unfinished ones
+        module = self.load()
+        solved: tuple[str, ...] = getattr(module, "PARTS", PARTS)
+        return [part for part in solved if callable(getattr(module, part, None))]
+
+    def run(self, part: str, data_directory: Optional[Path] = None) -> Result:
+        solver: Callable[..., Any] = getattr(self.load(), part)
+        filename = self.filename(data_directory=data_directory)
+        start = time.perf_counter()
+        answer = solver() if filename is None else solver(filename)
+        seconds = time.perf_counter() - start
+        return Result(day=self.day, part=part, answer=answer, seconds=seconds)
+
+
+def discover(directory: Path = DAYS_DIRECTORY) -> dict[int, Solver]:
+    solvers: dict[int, Solver] = {}
+    for path in sorted(directory.iterdir()):
+        match = DAY_MODULE_PATTERN.match(path.name)
+        if match:
+            day = int(match["day"])
+            solvers[day] = Solver(day=day, module_name=path.stem)
+    return solvers
+
+
+def iter_results(
+    days: Iterable[int],
+    parts: Iterable[str] = PARTS,
+    data_directory: Optional[Path] = None,
+    solvers: Optional[dict[int, Solver]] = None,
+) -> Iterator[Result]:
+    if solvers is None:
+        solvers = discover()
+    parts = tuple(parts)
+    for day in days:
+        if day not in solvers:
+            raise KeyError(f"No solver registered for day {day}")
+        solver = solvers[day]
+        for part in solver.parts():
+            if part in parts:
+                yield solver.run(part=part, data_directory=data_directory)
+
+
+def run(
+    days: Iterable[int],
+    parts: Iterable[str] = PARTS,
+    data_directory: Optional[Path] = None,
+) -> list[Result]:
+    return list(iter_results(days=days, parts=parts, data_directory=data_directory))
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="aoc")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the solvers for some days")
+    run_parser.add_argument("days", nargs="*", type=int, help="days to run (all)")
+    run_parser.add_argument(
+        "--part", choices=(1, 2), type=int, action="append", help="parts to run (all)"
+    )
+    run_parser.add_argument(
+        "--data-dir", type=Path, default=None, help="directory of dayN_data.txt files"
+    )
+
+    subparsers.add_parser("list", help="list the registered days")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = create_parser().parse_args(argv)
+    solvers = discover()
+    if args.command == "list":
+        for day, solver in solvers.items():
+            print(f"Day {day:02}: {solver.module_name}")
+        return None
+
+    days = args.days or list(solvers)
+    parts = [PARTS[part - 1] for part in args.part] if args.part else PARTS
+    results = iter_results(
+        days=days, parts=parts, data_directory=args.data_dir, solvers=solvers
+    )
+    for result in results:
+        timing = f"({result.seconds:.3f}s)"
+        print(f"Day {result.day:02} {result.part}: {result.answer} {timing}")
+    return None
+
+
+if __name__ == "__main__":
+    main()
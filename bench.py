@@ -0,0 +1,580 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from math import isqrt
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+import aoc
+import day02
+import day05
+import day08
+
+
+SCALES = (1, 10, 100, 1000)
+SEED = 2021
+WORKERS = (1, 2, 4, 8)
+COURSE_LOGS = 200
+TILE_SIZES = (128, 512, 2048)
+SEGMENTS = "abcdefg"
+DIGIT_SEGMENTS = (
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+)
+BASIN_SIZE = 8
+CHUNK_PAIRS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+
+class SyntheticInput(NamedTuple):
+    text: str
+    records: int
+
+
+class Measurement(NamedTuple):
+    day: int
+    part: str
+    scale: int
+    input_bytes: int
+    records: int
+    seconds: float
+    peak_memory_bytes: Optional[int]
+    records_per_second: float
+    error: Optional[str] = None
+
+
+class ScalingMeasurement(NamedTuple):
+    day: int
+    workers: int
+    scale: int
+    records: int
+    seconds: float
+    records_per_second: float
+    setting: str = ""
+
+
+def lines_input(lines: list[str]) -> SyntheticInput:
+    return SyntheticInput(text="\n".join(lines) + "\n", records=len(lines))
+
+
+def comma_input(numbers: list[int]) -> SyntheticInput:
+    return SyntheticInput(
+        text=",".join(str(number) for number in numbers) + "\n", records=len(numbers)
+    )
+
+
+def grid_lines(side: int, rng: random.Random, wall_chance: float = 0.0) -> list[str]:
+    rows: list[str] = []
+    for _ in range(side):
+        row = "".join(
+            "9" if rng.random() < wall_chance else str(rng.randint(0, 8))
+            for _ in range(side)
+        )
+        rows.append(row)
+    return rows
+
+
+def generate_day01(scale: int, rng: random.Random) -> SyntheticInput:
+    depth = 100
+    depths: list[int] = []
+    for _ in range(2000 * scale):
+        depth = max(0, depth + rng.randint(-5, 10))
+        depths.append(depth)
+    return lines_input([str(depth) for depth in depths])
+
+
+def generate_day02(scale: int, rng: random.Random) -> SyntheticInput:
+    directions = ("forward", "down", "up")
+    return lines_input(
+        [f"{rng.choice(directions)} {rng.randint(1, 9)}" for _ in range(1000 * scale)]
+    )
+
+
+def generate_day03(scale: int, rng: random.Random) -> SyntheticInput:
+    reports = {rng.getrandbits(12) for _ in range(1000 * scale)}
+    return lines_input([f"{report:012b}" for report in sorted(reports)])
+
+
+def generate_day04(scale: int, rng: random.Random) -> SyntheticInput:
+    numbers = list(range(100))
+    rng.shuffle(numbers)
+    lines = [",".join(str(number) for number in numbers)]
+    for _ in range(100 * scale):
+        cells = rng.sample(range(100), 25)
+        lines.append("")
+        for row in range(5):
+            lines.append(" ".join(f"{cell:2}" for cell in cells[row * 5 : row * 5 + 5]))
+    return SyntheticInput(text="\n".join(lines) + "\n", records=100 * scale)
+
+
+def generate_day05(scale: int, rng: random.Random) -> SyntheticInput:
+    size = 1000 * isqrt(scale)
+    vents: list[str] = []
+    for _ in range(500 * scale):
+        x1, y1 = rng.randrange(size), rng.randrange(size)
+        length = rng.randint(1, size // 2)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = min(size - 1, x1 + length), y1
+        elif kind == 1:
+            x2, y2 = x1, min(size - 1, y1 + length)
+        else:
+            length = min(length, size - 1 - x1, size - 1 - y1)
+            x2, y2 = x1 + length, y1 + length
+            if rng.random() < 0.5:
+                x1, x2 = x2, x1
+        vents.append(f"{x1},{y1} -> {x2},{y2}")
+    return lines_input(vents)
+
+
+def generate_day06(scale: int, rng: random.Random) -> SyntheticInput:
+    return comma_input([rng.randint(1, 5) for _ in range(300 * scale)])
+
+
+def generate_day07(scale: int, rng: random.Random) -> SyntheticInput:
+    spread = 2000 * isqrt(scale)
+    return comma_input([int(rng.expovariate(3 / spread)) for _ in range(1000 * scale)])
+
+
+def generate_day08(scale: int, rng: random.Random) -> SyntheticInput:
+    entries: list[str] = []
+    for _ in range(200 * scale):
+        wiring = dict(zip(SEGMENTS, rng.sample(SEGMENTS, len(SEGMENTS))))
+
+        def wire(segments: str) -> str:
+            letters = [wiring[segment] for segment in segments]
+            rng.shuffle(letters)
+            return "".join(letters)
+
+        patterns = [wire(segments) for segments in DIGIT_SEGMENTS]
+        rng.shuffle(patterns)
+        outputs = [wire(rng.choice(DIGIT_SEGMENTS)) for _ in range(4)]
+        entries.append(f"{' '.join(patterns)} | {' '.join(outputs)}")
+    return lines_input(entries)
+
+
+def generate_day09(scale: int, rng: random.Random) -> SyntheticInput:
+    # basins are walled in by ridges of 9s, like the puzzle input, to keep
+    # HeightMap.get_basin within the recursion limit
+    rows = grid_lines(side=100 * isqrt(scale), rng=rng, wall_chance=0.2)
+    return lines_input(
+        [
+            "".join(
+                "9" if x % BASIN_SIZE == 0 or y % BASIN_SIZE == 0 else height
+                for x, height in enumerate(row)
+            )
+            for y, row in enumerate(rows)
+        ]
+    )
+
+
+def generate_day10(scale: int, rng: random.Random) -> SyntheticInput:
+    lines: list[str] = []
+    for _ in range(100 * scale):
+        line = ""
+        stack: list[str] = []
+        for _ in range(rng.randint(20, 110)):
+            if stack and rng.random() < 0.45:
+                line += CHUNK_PAIRS[stack.pop()]
+            else:
+                open_chunk = rng.choice(tuple(CHUNK_PAIRS))
+                stack.append(open_chunk)
+                line += open_chunk
+        if stack and rng.random() < 0.5:
+            line += rng.choice([close for close in CHUNK_PAIRS.values()])
+        lines.append(line)
+    return lines_input(lines)
+
+
+def generate_day11(scale: int, rng: random.Random) -> SyntheticInput:
+    rows = grid_lines(side=10 * isqrt(scale), rng=rng)
+    return lines_input(rows)
+
+
+def generate_day12(scale: int, rng: random.Random) -> SyntheticInput:
+    # path counts grow exponentially with the cave count, so the graph only
+    # gains a small cave every time the scale doubles
+    big_caves = ["AA", "BB", "CC"]
+    small_caves = list(string.ascii_lowercase[: 4 + scale.bit_length()])
+    edges: set[tuple[str, str]] = set()
+    for cave in small_caves:
+        edges.add((rng.choice(big_caves), cave))
+    for cave, connected_cave in zip(small_caves, small_caves[1:]):
+        if rng.random() < 0.5:
+            edges.add((cave, connected_cave))
+    edges.add(("start", big_caves[0]))
+    edges.add(("start", small_caves[0]))
+    edges.add((big_caves[-1], "end"))
+    edges.add((small_caves[-1], "end"))
+    return lines_input([f"{cave}-{connected}" for cave, connected in sorted(edges)])
+
+
+def generate_day14(scale: int, rng: random.Random) -> SyntheticInput:
+    elements = "BCFHKNOPSV"
+    template = "".join(rng.choice(elements) for _ in range(20 * scale))
+    lines = [template, ""]
+    for first in elements:
+        for second in elements:
+            lines.append(f"{first}{second} -> {rng.choice(elements)}")
+    return SyntheticInput(text="\n".join(lines) + "\n", records=len(template))
+
+
+GENERATORS: dict[int, Callable[[int, random.Random], SyntheticInput]] = {
+    1: generate_day01,
+    2: generate_day02,
+    3: generate_day03,
+    4: generate_day04,
+    5: generate_day05,
+    6: generate_day06,
+    7: generate_day07,
+    8: generate_day08,
+    9: generate_day09,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    # day 13's folds raise IndexError on any paper with dots above the fold
+    # line, so like the unsolved days it has no generator until that is fixed
+    14: generate_day14,
+}
+
+
+def write_input(
+    solver: aoc.Solver, scale: int, directory: Path, seed: int = SEED
+) -> tuple[Path, SyntheticInput]:
+    filename = solver.filename(data_directory=directory)
+    if filename is None:
+        raise ValueError(f"Day {solver.day} does not read an input file")
+    synthetic_input = GENERATORS[solver.day](scale, random.Random(seed + solver.day))
+    path = Path(filename)
+    path.write_text(synthetic_input.text)
+    return path, synthetic_input
+
+
+def measure(
+    solver: aoc.Solver,
+    part: str,
+    scale: int,
+    directory: Path,
+    synthetic_input: SyntheticInput,
+    trace_memory: bool = True,
+) -> Measurement:
+    measurement = Measurement(
+        day=solver.day,
+        part=part,
+        scale=scale,
+        input_bytes=len(synthetic_input.text),
+        records=synthetic_input.records,
+        seconds=0.0,
+        peak_memory_bytes=None,
+        records_per_second=0.0,
+    )
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            result = solver.run(part=part, data_directory=directory)
+            peak_memory_bytes: Optional[int] = None
+            if trace_memory:
+                tracemalloc.start()
+                solver.run(part=part, data_directory=directory)
+                _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        except Exception as error:
+            return measurement._replace(error=repr(error))
+        finally:
+            tracemalloc.stop()
+
+    return measurement._replace(
+        seconds=result.seconds,
+        peak_memory_bytes=peak_memory_bytes,
+        records_per_second=synthetic_input.records / max(result.seconds, 1e-9),
+    )
+
+
+def iter_measurements(
+    days: Iterable[int],
+    scales: Iterable[int] = SCALES,
+    parts: Iterable[str] = aoc.PARTS,
+    trace_memory: bool = True,
+) -> Iterator[Measurement]:
+    solvers = aoc.discover()
+    parts = tuple(parts)
+    for day in days:
+        solver = solvers[day]
+        for scale in scales:
+            with tempfile.TemporaryDirectory() as temporary_directory:
+                directory = Path(temporary_directory)
+                _, synthetic_input = write_input(
+                    solver=solver, scale=scale, directory=directory
+                )
+                for part in solver.parts():
+                    if part in parts:
+                        yield measure(
+                            solver=solver,
+                            part=part,
+                            scale=scale,
+                            directory=directory,
+                            synthetic_input=synthetic_input,
+                            trace_memory=trace_memory,
+                        )
+
+
+def scaling_day02(
+    scale: int, workers_counts: Iterable[int], directory: Path
+) -> Iterator[ScalingMeasurement]:
+    filenames: list[str] = []
+    records = 0
+    for log in range(COURSE_LOGS):
+        synthetic_input = generate_day02(scale, random.Random(SEED + log))
+        path = directory / f"course_{log:04}.txt"
+        path.write_text(synthetic_input.text)
+        filenames.append(str(path))
+        records += synthetic_input.records
+
+    for workers in workers_counts:
+        start = time.perf_counter()
+        day02.replay_courses(filenames, workers=workers)
+        seconds = time.perf_counter() - start
+        yield ScalingMeasurement(
+            day=2,
+            workers=workers,
+            scale=scale,
+            records=records,
+            seconds=seconds,
+            records_per_second=records / max(seconds, 1e-9),
+            setting=f"{COURSE_LOGS} logs",
+        )
+
+
+def scaling_day05(
+    scale: int, workers_counts: Iterable[int], directory: Path
+) -> Iterator[ScalingMeasurement]:
+    path = directory / "vents.txt"
+    path.write_text(generate_day05(scale, random.Random(SEED + 5)).text)
+    vents = day05.load_vents(str(path), angled=True)
+    records = sum(vent.length() for vent in vents)
+    for tile_size in TILE_SIZES:
+        for workers in workers_counts:
+            start = time.perf_counter()
+            day05.tiled_overlap(vents, tile_size=tile_size, workers=workers)
+            seconds = time.perf_counter() - start
+            yield ScalingMeasurement(
+                day=5,
+                workers=workers,
+                scale=scale,
+                records=records,
+                seconds=seconds,
+                records_per_second=records / max(seconds, 1e-9),
+                setting=f"tile {tile_size}",
+            )
+
+
+def scaling_day08(
+    scale: int, workers_counts: Iterable[int], directory: Path
+) -> Iterator[ScalingMeasurement]:
+    path = directory / "notes.txt"
+    synthetic_input = generate_day08(scale, random.Random(SEED + 8))
+    path.write_text(synthetic_input.text)
+    for workers in workers_counts:
+        start = time.perf_counter()
+        day08.decode_notes(str(path), workers=workers)
+        seconds = time.perf_counter() - start
+        yield ScalingMeasurement(
+            day=8,
+            workers=workers,
+            scale=scale,
+            records=synthetic_input.records,
+            seconds=seconds,
+            records_per_second=synthetic_input.records / max(seconds, 1e-9),
+            setting=f"{day08.CHUNKS_PER_WORKER} chunks per worker",
+        )
+
+
+SCALING_RUNNERS: dict[
+    int, Callable[[int, Iterable[int], Path], Iterator[ScalingMeasurement]]
+] = {
+    2: scaling_day02,
+    5: scaling_day05,
+    8: scaling_day08,
+}
+
+
+def iter_scaling_measurements(
+    days: Iterable[int], scale: int, workers_counts: Iterable[int]
+) -> Iterator[ScalingMeasurement]:
+    workers_counts = tuple(workers_counts)
+    for day in days:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            yield from SCALING_RUNNERS[day](
+                scale, workers_counts, Path(temporary_directory)
+            )
+
+
+def current_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=aoc.DAYS_DIRECTORY,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def create_report(measurements: Iterable[NamedTuple]) -> dict:
+    return {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "measurements": [measurement._asdict() for measurement in measurements],
+    }
+
+
+def load_measurements(filename: Path) -> dict[tuple[int, str, int], Measurement]:
+    report = json.loads(filename.read_text())
+    measurements = (Measurement(**item) for item in report["measurements"])
+    return {
+        (measurement.day, measurement.part, measurement.scale): measurement
+        for measurement in measurements
+    }
+
+
+def compare(base_filename: Path, head_filename: Path) -> None:
+    base = load_measurements(base_filename)
+    head = load_measurements(head_filename)
+    for key in sorted(base.keys() & head.keys()):
+        day, part, scale = key
+        if base[key].error or head[key].error:
+            print(f"Day {day:02} {part} x{scale}: failed")
+            continue
+        speedup = base[key].seconds / max(head[key].seconds, 1e-9)
+        line = (
+            f"Day {day:02} {part} x{scale}: "
+            f"{base[key].seconds:.4f}s -> {head[key].seconds:.4f}s ({speedup:.2f}x)"
+        )
+        base_peak = base[key].peak_memory_bytes
+        head_peak = head[key].peak_memory_bytes
+        if base_peak and head_peak:
+            line = f"{line}, peak {base_peak} -> {head_peak} bytes"
+        print(line)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bench")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="benchmark the solvers")
+    run_parser.add_argument("days", nargs="*", type=int, help="days to run (all)")
+    run_parser.add_argument(
+        "--scale", type=int, action="append", help="input size multipliers"
+    )
+    run_parser.add_argument(
+        "--part", choices=(1, 2), type=int, action="append", help="parts to run (all)"
+    )
+    run_parser.add_argument(
+        "--no-memory", action="store_true", help="skip the tracemalloc peak run"
+    )
+    run_parser.add_argument(
+        "--output", type=Path, default=Path("bench_output.json"), help="report file"
+    )
+
+    generate_parser = subparsers.add_parser("generate", help="write synthetic inputs")
+    generate_parser.add_argument("days", nargs="*", type=int, help="days (all)")
+    generate_parser.add_argument("--scale", type=int, default=1)
+    generate_parser.add_argument("--output-dir", type=Path, default=Path("."))
+
+    scaling_parser = subparsers.add_parser(
+        "scaling", help="benchmark the parallel runners against worker count"
+    )
+    scaling_parser.add_argument("days", nargs="*", type=int, help="days (all)")
+    scaling_parser.add_argument("--scale", type=int, default=10)
+    scaling_parser.add_argument(
+        "--workers", type=int, action="append", help="worker counts to try"
+    )
+    scaling_parser.add_argument(
+        "--output", type=Path, default=Path("bench_scaling.json"), help="report file"
+    )
+
+    compare_parser = subparsers.add_parser("compare", help="compare two reports")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("head", type=Path)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        compare(base_filename=args.base, head_filename=args.head)
+        return None
+
+    if args.command == "scaling":
+        scaling_measurements: list[ScalingMeasurement] = []
+        for scaling_measurement in iter_scaling_measurements(
+            days=args.days or list(SCALING_RUNNERS),
+            scale=args.scale,
+            workers_counts=args.workers or WORKERS,
+        ):
+            print(
+                f"Day {scaling_measurement.day:02} {scaling_measurement.setting} "
+                f"x{scaling_measurement.scale}, {scaling_measurement.workers} workers: "
+                f"{scaling_measurement.seconds:.4f}s, "
+                f"{scaling_measurement.records_per_second:.0f} rec/s"
+            )
+            scaling_measurements.append(scaling_measurement)
+        report = create_report(scaling_measurements)
+        args.output.write_text(json.dumps(report, indent=2))
+        return None
+
+    days = args.days or list(GENERATORS)
+    missing = [day for day in days if day not in GENERATORS]
+    if missing:
+        parser.error(f"no input generator for days {missing}")
+    if args.command == "generate":
+        solvers = aoc.discover()
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        for day in days:
+            path, _ = write_input(
+                solver=solvers[day], scale=args.scale, directory=args.output_dir
+            )
+            print(f"Day {day:02}: {path}")
+        return None
+
+    parts = [aoc.PARTS[part - 1] for part in args.part] if args.part else aoc.PARTS
+    measurements: list[Measurement] = []
+    for measurement in iter_measurements(
+        days=days,
+        scales=args.scale or SCALES,
+        parts=parts,
+        trace_memory=not args.no_memory,
+    ):
+        label = f"Day {measurement.day:02} {measurement.part} x{measurement.scale}"
+        if measurement.error:
+            print(f"{label}: {measurement.error}")
+        else:
+            print(
+                f"{label}: {measurement.seconds:.4f}s, "
+                f"{measurement.records_per_second:.0f} rec/s"
+            )
+        measurements.append(measurement)
+    args.output.write_text(json.dumps(create_report(measurements), indent=2))
+    return None
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,26 @@
+import sys
 from collections import deque
-from typing import Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from operator import gt
+from typing import BinaryIO, Deque, Iterable, Iterator, NamedTuple, Sequence
+
+from loader import parse_integers, read_integers
 
 
 FILENAME = "day1_data.txt"
 
+WINDOW_SIZE = 3
+CHUNK_SIZE = 1 << 16
+CHECKPOINT_READINGS = 100_000
+
 
 def yield_data(filename: str) -> Iterator[int]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield int(line.strip())
+    return iter(read_integers(filename))
 
 
-def yield_sliding_data(data: Iterator[int]) -> Iterator[int]:
-    items = deque((next(data), next(data)), maxlen=3)
+def yield_sliding_data(data: Iterator[int], window: int = WINDOW_SIZE) -> Iterator[int]:
+    items = deque(islice(data, window - 1), maxlen=window)
     for number in data:
         items.append(number)
         yield (sum(items))
@@ -28,11 +36,97 @@ def count_increase(data: Iterator[int]) -> int:
     return count
 
 
+def count_window_increase(depths: Sequence[int], window: int = WINDOW_SIZE) -> int:
+    # consecutive window sums share window - 1 readings, so the later sum is
+    # bigger exactly when the reading entering it beats the one leaving it
+    return sum(map(gt, islice(depths, window, None), depths))
+
+
+class Checkpoint(NamedTuple):
+    readings: int
+    increases: dict[int, int]
+
+
+@dataclass
+class DepthCounter:
+    windows: tuple[int, ...] = (1, WINDOW_SIZE)
+    readings: int = field(default=0, init=False)
+    increases: dict[int, int] = field(default_factory=dict, init=False)
+    history: Deque[int] = field(default_factory=deque, init=False, repr=False)
+    partial: bytes = field(default=b"", init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.increases = {window: 0 for window in self.windows}
+        self.history = deque(maxlen=max(self.windows))
+
+    def add_depths(self, depths: Sequence[int]) -> None:
+        depths = [*self.history, *depths]
+        new_start = len(self.history)
+        for window in self.windows:
+            start = max(window, new_start)
+            entering = islice(depths, start, None)
+            leaving = islice(depths, start - window, None)
+            self.increases[window] += sum(map(gt, entering, leaving))
+        self.readings += len(depths) - new_start
+        self.history.extend(depths[new_start:])
+
+    def feed(self, chunk: bytes) -> None:
+        data = self.partial + chunk
+        end = data.rfind(b"\n") + 1
+        self.partial = data[end:]
+        self.add_depths(parse_integers(data[:end]))
+
+    def close(self) -> Checkpoint:
+        self.add_depths(parse_integers(self.partial))
+        self.partial = b""
+        return self.checkpoint()
+
+    def checkpoint(self) -> Checkpoint:
+        return Checkpoint(readings=self.readings, increases=dict(self.increases))
+
+
+def iter_checkpoints(
+    chunks: Iterable[bytes],
+    windows: tuple[int, ...] = (1, WINDOW_SIZE),
+    every: int = CHECKPOINT_READINGS,
+) -> Iterator[Checkpoint]:
+    counter = DepthCounter(windows=windows)
+    next_checkpoint = every
+    for chunk in chunks:
+        counter.feed(chunk)
+        if counter.readings >= next_checkpoint:
+            yield counter.checkpoint()
+            next_checkpoint = (counter.readings // every + 1) * every
+    yield counter.close()
+
+
+def stream_checkpoints(
+    stream: BinaryIO,
+    windows: tuple[int, ...] = (1, WINDOW_SIZE),
+    every: int = CHECKPOINT_READINGS,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Checkpoint]:
+    chunks = iter(lambda: stream.read(chunk_size), b"")
+    return iter_checkpoints(chunks=chunks, windows=windows, every=every)
+
+
+def part_one(filename: str) -> int:
+    depths = read_integers(filename)
+    return count_window_increase(depths, window=1)
+
+
+def part_two(filename: str) -> int:
+    depths = read_integers(filename)
+    return count_window_increase(depths, window=WINDOW_SIZE)
+
+
 def main():
-    data = yield_data(FILENAME)
-    sliding_data = yield_sliding_data(data)
-    result = count_increase(sliding_data)
-    print(f"{result=}")
+    if sys.argv[1:] == ["-"]:
+        for checkpoint in stream_checkpoints(sys.stdin.buffer):
+            print(checkpoint)
+        return None
+    print(f"Part one: {part_one(FILENAME)}")
+    print(f"Part two: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,21 @@
-from typing import Callable, Iterator, NamedTuple
+import os
+from typing import Callable, Iterator, NamedTuple, Optional, Sequence
 from dataclasses import dataclass, field
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from itertools import accumulate
+from operator import mul
+
+from loader import iter_windows, map_file
 
 FILENAME = "day2_data.txt"
 
+SHARDS_PER_WORKER = 4
+
+FORWARD = {b"forward": 1, b"down": 0, b"up": 0}
+AIM_CHANGE = {b"forward": 0, b"down": 1, b"up": -1}
+
 
 class Command(NamedTuple):
     direction: str
@@ -63,14 +76,120 @@ class Course2(Course):
         self.aim += amount
 
 
-def main():
-    # course = Course()
-    course = Course2()
-    commands = yield_data(FILENAME)
+class CommandBatch(NamedTuple):
+    forwards: array
+    aim_changes: array
+
+
+class Trajectory(NamedTuple):
+    horizontal_pos: array
+    depth: array
+    aim: array
+
+
+def parse_command_batch(data: bytes) -> CommandBatch:
+    tokens = data.split()
+    directions = tokens[0::2]
+    amounts = array("q", map(int, tokens[1::2]))
+    forwards = array("q", map(mul, map(FORWARD.__getitem__, directions), amounts))
+    aim_changes = array("q", map(mul, map(AIM_CHANGE.__getitem__, directions), amounts))
+    return CommandBatch(forwards=forwards, aim_changes=aim_changes)
+
+
+def read_command_batch(filename: str) -> CommandBatch:
+    batch = CommandBatch(forwards=array("q"), aim_changes=array("q"))
+    with map_file(filename) as data:
+        for window in iter_windows(data):
+            window_batch = parse_command_batch(window)
+            batch.forwards.extend(window_batch.forwards)
+            batch.aim_changes.extend(window_batch.aim_changes)
+    return batch
+
+
+def batch_course(batch: CommandBatch) -> Course:
+    return Course(horizontal_pos=sum(batch.forwards), depth=sum(batch.aim_changes))
+
+
+def batch_course2(batch: CommandBatch) -> Course2:
+    aims = accumulate(batch.aim_changes)
+    return Course2(
+        horizontal_pos=sum(batch.forwards),
+        depth=sum(map(mul, aims, batch.forwards)),
+        aim=sum(batch.aim_changes),
+    )
+
+
+def batch_trajectory(batch: CommandBatch) -> Trajectory:
+    aim = array("q", accumulate(batch.aim_changes))
+    return Trajectory(
+        horizontal_pos=array("q", accumulate(batch.forwards)),
+        depth=array("q", accumulate(map(mul, aim, batch.forwards))),
+        aim=aim,
+    )
+
+
+class CourseResult(NamedTuple):
+    filename: str
+    horizontal_pos: int
+    depth: int
+    aim: int
+
+    @property
+    def multiply(self) -> int:
+        return self.horizontal_pos * self.depth
+
+
+def replay_course(filename: str) -> CourseResult:
+    course = batch_course2(read_command_batch(filename))
+    return CourseResult(
+        filename=filename,
+        horizontal_pos=course.horizontal_pos,
+        depth=course.depth,
+        aim=course.aim,
+    )
+
+
+def replay_shard(filenames: Sequence[str]) -> list[CourseResult]:
+    return [replay_course(filename) for filename in filenames]
+
+
+def replay_courses(
+    filenames: Sequence[str],
+    workers: Optional[int] = None,
+    shard_size: Optional[int] = None,
+) -> list[CourseResult]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(filenames) <= 1:
+        return replay_shard(filenames)
+    if shard_size is None:
+        shard_size = max(1, ceil(len(filenames) / (workers * SHARDS_PER_WORKER)))
+    shards = [
+        filenames[index : index + shard_size]
+        for index in range(0, len(filenames), shard_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shard_results = executor.map(replay_shard, shards)
+        return [result for results in shard_results for result in results]
+
+
+def plot_course(filename: str, course: Course) -> Course:
+    commands = yield_data(filename)
     for command in commands:
         course.move(command)
+    return course
+
+
+def part_one(filename: str) -> int:
+    return batch_course(read_command_batch(filename)).multiply
+
 
-    print(course, course.multiply)
+def part_two(filename: str) -> int:
+    return batch_course2(read_command_batch(filename)).multiply
+
+
+def main():
+    print(f"Part one: {part_one(FILENAME)}")
+    print(f"Part two: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
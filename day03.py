@@ -1,6 +1,16 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from loader import iter_windows, map_file
+
 FILENAME = "day3_data.txt"
 
 
+def popcount(bitset: int) -> int:
+    # int.bit_count is only there from Python 3.10
+    return bin(bitset).count("1")
+
+
 def read_data(filename: str) -> list[str]:
     with open(file=filename, mode="r") as read_file:
         return [line.strip() for line in read_file]
@@ -56,10 +66,148 @@ def life_support_rating(binarys: list[str]) -> int:
     return oxygen * c02
 
 
+@dataclass
+class PackedReport:
+    width: int
+    rows: list[int] = field(default_factory=list, repr=False)
+    columns: list[int] = field(default_factory=list, repr=False)
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+    def all_rows(self) -> int:
+        return (1 << self.count) - 1
+
+    def row(self, mask: int) -> int:
+        return self.rows[self.count - mask.bit_length()]
+
+    def ones(self, column: int, mask: int) -> int:
+        return popcount(self.columns[column] & mask)
+
+    def most_common(self) -> int:
+        common = 0
+        for column in range(self.width):
+            common <<= 1
+            if self.ones(column, self.all_rows()) * 2 >= self.count:
+                common |= 1
+        return common
+
+    def power_consumption(self) -> int:
+        most_common = self.most_common()
+        least_common = most_common ^ ((1 << self.width) - 1)
+        return most_common * least_common
+
+    def rating(self, keep_most_common: bool) -> int:
+        mask = self.all_rows()
+        for column in range(self.width):
+            size = popcount(mask)
+            if size == 1:
+                break
+            ones_most_common = self.ones(column, mask) * 2 >= size
+            if ones_most_common == keep_most_common:
+                filtered_mask = mask & self.columns[column]
+            else:
+                filtered_mask = mask & ~self.columns[column]
+            if filtered_mask:
+                mask = filtered_mask
+        return self.row(mask)
+
+    def oxygen_rating(self) -> int:
+        return self.rating(keep_most_common=True)
+
+    def co2_rating(self) -> int:
+        return self.rating(keep_most_common=False)
+
+    def life_support_rating(self) -> int:
+        return self.oxygen_rating() * self.co2_rating()
+
+
+@dataclass
+class ReportIndex:
+    width: int
+    rows: list[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self.rows.sort()
+
+    def rating(self, keep_most_common: bool, tie_bit: int) -> int:
+        # rows sharing the bits chosen so far are a contiguous run of the
+        # sorted rows, which splits at the first row with the next bit set
+        low, high, prefix = 0, len(self.rows), 0
+        for column in range(self.width):
+            if high - low <= 1:
+                break
+            bit = 1 << (self.width - 1 - column)
+            split = bisect_left(self.rows, prefix | bit, low, high)
+            zeros = split - low
+            ones = high - split
+            if ones == zeros:
+                keep_ones = tie_bit == 1
+            else:
+                keep_ones = (ones > zeros) == keep_most_common
+            if keep_ones and ones or not zeros:
+                low = split
+                prefix |= bit
+            else:
+                high = split
+        return self.rows[low]
+
+    def oxygen_rating(self, tie_bit: int = 1) -> int:
+        return self.rating(keep_most_common=True, tie_bit=tie_bit)
+
+    def co2_rating(self, tie_bit: int = 0) -> int:
+        return self.rating(keep_most_common=False, tie_bit=tie_bit)
+
+    def life_support_rating(self) -> int:
+        return self.oxygen_rating() * self.co2_rating()
+
+
+def index_report(report: PackedReport) -> ReportIndex:
+    return ReportIndex(width=report.width, rows=list(report.rows))
+
+
+def pack_report(binarys: list[bytes]) -> PackedReport:
+    # row i of the report is bit (count - 1 - i) of every column bitset
+    return PackedReport(
+        width=len(binarys[0]) if binarys else 0,
+        rows=[int(binary, 2) for binary in binarys],
+        columns=[int(bytes(column), 2) for column in zip(*binarys)],
+    )
+
+
+def read_packed_report(filename: str) -> PackedReport:
+    rows: list[int] = []
+    column_bits: list[list[bytes]] = []
+    with map_file(filename) as data:
+        for window in iter_windows(data):
+            binarys = window.split()
+            if not binarys:
+                continue
+            if not column_bits:
+                column_bits = [[] for _ in binarys[0]]
+            rows.extend(int(binary, 2) for binary in binarys)
+            for bits, column in zip(column_bits, zip(*binarys)):
+                bits.append(bytes(column))
+    # each column bitset is built once; base 2 parsing is linear in its length
+    return PackedReport(
+        width=len(column_bits),
+        rows=rows,
+        columns=[int(b"".join(bits), 2) for bits in column_bits],
+    )
+
+
+def part_one(filename: str) -> int:
+    return read_packed_report(filename).power_consumption()
+
+
+def part_two(filename: str) -> int:
+    return index_report(read_packed_report(filename)).life_support_rating()
+
+
 def main():
-    binarys = read_data(FILENAME)
-    print(power_consumption(binarys))
-    print(life_support_rating(binarys))
+    print(f"Part one: {part_one(FILENAME)}")
+    print(f"Part two: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,17 @@
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
 from dataclasses import dataclass, field
+from array import array
+from collections import defaultdict
+from itertools import chain
+from operator import attrgetter
+
+from loader import COMMA_TABLE, map_file, parse_integers
 
 
 FILENAME = "day4_data.txt"
 
+BOARD_SIZE = 5
+
 
 @dataclass
 class Number:
@@ -17,7 +25,7 @@ class Number:
         return number
 
 
-def check_line(line: list[Number]) -> bool:
+def check_line(line: list["NumberLike"]) -> bool:
     return all(number.picked for number in line)
 
 
@@ -51,14 +59,155 @@ class Board:
                     total += number.value
         return total
 
+    def values(self) -> list[list[int]]:
+        return [[number.value for number in row] for row in self.rows]
+
+
+@dataclass
+class BoardStore:
+    size: int = BOARD_SIZE
+    cells: array = field(default_factory=lambda: array("q"), repr=False)
+    marked: bytearray = field(default_factory=bytearray, repr=False)
+
+    def __post_init__(self) -> None:
+        self.marked.extend(bytes(self._marked_bytes() - len(self.marked)))
+
+    def __len__(self) -> int:
+        return len(self.cells) // (self.size * self.size)
+
+    def __getitem__(self, index: int) -> "StoredBoard":
+        if not 0 <= index < len(self):
+            raise IndexError("board index out of range")
+        return StoredBoard(store=self, index=index)
+
+    def __iter__(self) -> Iterator["StoredBoard"]:
+        for index in range(len(self)):
+            yield StoredBoard(store=self, index=index)
+
+    def _marked_bytes(self) -> int:
+        return (len(self.cells) + 7) // 8
+
+    def add_board(self, values: Iterable[int]) -> None:
+        self.cells.extend(values)
+        self.marked.extend(bytes(self._marked_bytes() - len(self.marked)))
+
+    def is_marked(self, cell: int) -> bool:
+        return bool(self.marked[cell >> 3] & (1 << (cell & 7)))
+
+    def mark(self, cell: int) -> None:
+        self.marked[cell >> 3] |= 1 << (cell & 7)
+
+    def unmark(self, cell: int) -> None:
+        self.marked[cell >> 3] &= ~(1 << (cell & 7))
+
+
+@dataclass(eq=False)
+class StoredNumber:
+    # a view of one store cell, so marking it marks the store
+    __slots__ = ("store", "cell")
+    store: BoardStore
+    cell: int
+
+    @property
+    def value(self) -> int:
+        return self.store.cells[self.cell]
+
+    @property
+    def picked(self) -> bool:
+        return self.store.is_marked(self.cell)
+
+    @picked.setter
+    def picked(self, picked: bool) -> None:
+        if picked:
+            self.store.mark(self.cell)
+        else:
+            self.store.unmark(self.cell)
+
+    def __repr__(self) -> str:
+        number = str(self.value)
+        if self.picked:
+            number = f"{number}*"
+        return number
+
+
+NumberLike = Union[Number, StoredNumber]
+
+
+@dataclass(eq=False)
+class StoredBoard:
+    __slots__ = ("store", "index")
+    store: BoardStore
+    index: int
+
+    def _cells(self) -> range:
+        area = self.store.size * self.store.size
+        return range(self.index * area, (self.index + 1) * area)
+
+    def _lines(self) -> Iterator[range]:
+        size = self.store.size
+        start = self._cells().start
+        for row in range(size):
+            yield range(start + row * size, start + (row + 1) * size)
+        for column in range(size):
+            yield range(start + column, start + size * size, size)
+
+    def _numbers(self, cells: range) -> list[StoredNumber]:
+        return [StoredNumber(store=self.store, cell=cell) for cell in cells]
+
+    @property
+    def rows(self) -> list[list[StoredNumber]]:
+        size = self.store.size
+        cells = self._cells()
+        return [
+            self._numbers(cells[row * size : (row + 1) * size]) for row in range(size)
+        ]
+
+    def mark_off_number(self, picked_number: int) -> None:
+        cells = self.store.cells
+        for cell in self._cells():
+            if cells[cell] == picked_number:
+                self.store.mark(cell)
+
+    def winning_line(self) -> list[StoredNumber]:
+        for line in self._lines():
+            if all(map(self.store.is_marked, line)):
+                return self._numbers(line)
+        return []
+
+    def sum_unmarked(self) -> int:
+        cells = self.store.cells
+        return sum(
+            cells[cell] for cell in self._cells() if not self.store.is_marked(cell)
+        )
+
+    def values(self) -> list[list[int]]:
+        size = self.store.size
+        start = self._cells().start
+        cells = self.store.cells
+        return [
+            cells[start + row * size : start + (row + 1) * size].tolist()
+            for row in range(size)
+        ]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StoredBoard):
+            return NotImplemented
+        return self.store is other.store and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.index))
+
+
+BoardLike = Union[Board, StoredBoard]
+
 
 @dataclass
 class Bingo:
     numbers: list[int] = field(default_factory=list)
-    boards: list[Board] = field(default_factory=list)
+    boards: list[BoardLike] = field(default_factory=list)
     last_number: Optional[int] = None
 
-    def winning_board(self) -> Optional[Board]:
+    def winning_board(self) -> Optional[BoardLike]:
         for number in self.numbers:
             for board in self.boards:
                 board.mark_off_number(number)
@@ -73,8 +222,8 @@ class Bingo:
             return board.sum_unmarked() * self.last_number
         return None
 
-    def last_winning_baord(self) -> Optional[Board]:
-        winning_boards: list[Board] = []
+    def last_winning_baord(self) -> Optional[BoardLike]:
+        winning_boards: list[BoardLike] = []
         for number in self.numbers:
             for board in self.boards:
                 if board in winning_boards:
@@ -93,6 +242,104 @@ class Bingo:
         return None
 
 
+class Win(NamedTuple):
+    board: int
+    number: int
+    turn: int
+    score: int
+
+
+@dataclass
+class BingoEngine:
+    numbers: list[int] = field(default_factory=list)
+    boards: list[BoardLike] = field(default_factory=list)
+    size: int = field(default=0, init=False)
+    positions: dict[int, list[tuple[int, int]]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False
+    )
+    marked: list[int] = field(default_factory=list, init=False, repr=False)
+    row_hits: list[int] = field(default_factory=list, init=False, repr=False)
+    column_hits: list[int] = field(default_factory=list, init=False, repr=False)
+    unmarked: list[int] = field(default_factory=list, init=False, repr=False)
+    won: list[bool] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.size = len(self.boards[0].values()) if self.boards else 0
+        for board_index, board in enumerate(self.boards):
+            values = list(chain.from_iterable(board.values()))
+            for cell, value in enumerate(values):
+                self.positions[value].append((board_index, cell))
+            # the engine replays every draw, so marks already on the boards are
+            # ignored rather than subtracted a second time
+            self.unmarked.append(sum(values))
+        self.marked = [0] * len(self.boards)
+        self.row_hits = [0] * (len(self.boards) * self.size)
+        self.column_hits = [0] * (len(self.boards) * self.size)
+        self.won = [False] * len(self.boards)
+
+    def mark(self, number: int) -> list[int]:
+        winners: list[int] = []
+        for board_index, cell in self.positions.get(number, ()):
+            cell_bit = 1 << cell
+            if self.won[board_index] or self.marked[board_index] & cell_bit:
+                continue
+            self.marked[board_index] |= cell_bit
+            self.unmarked[board_index] -= number
+            row, column = divmod(cell, self.size)
+            line_index = board_index * self.size
+            self.row_hits[line_index + row] += 1
+            self.column_hits[line_index + column] += 1
+            if (
+                self.row_hits[line_index + row] == self.size
+                or self.column_hits[line_index + column] == self.size
+            ):
+                self.won[board_index] = True
+                winners.append(board_index)
+        return winners
+
+    def play(self) -> Iterator[Win]:
+        boards_left = len(self.boards)
+        for turn, number in enumerate(self.numbers):
+            for board_index in self.mark(number):
+                score = self.unmarked[board_index] * number
+                yield Win(board=board_index, number=number, turn=turn, score=score)
+                boards_left -= 1
+            if not boards_left:
+                return None
+        return None
+
+
+def draw_turns(numbers: list[int]) -> dict[int, int]:
+    turns: dict[int, int] = {}
+    for turn, number in enumerate(numbers):
+        turns.setdefault(number, turn)
+    return turns
+
+
+def rank_boards(numbers: list[int], boards: list[BoardLike]) -> list[Win]:
+    turns = draw_turns(numbers)
+    never_drawn = len(numbers)
+    wins: list[Win] = []
+    for board_index, board in enumerate(boards):
+        values = board.values()
+        rows = [[turns.get(value, never_drawn) for value in row] for row in values]
+        # a line is complete on the turn its last number is drawn
+        turn = min(map(max, chain(rows, zip(*rows))), default=never_drawn)
+        if turn == never_drawn:
+            continue
+        unmarked = sum(
+            value
+            for value in chain.from_iterable(values)
+            if turns.get(value, never_drawn) > turn
+        )
+        number = numbers[turn]
+        wins.append(
+            Win(board=board_index, number=number, turn=turn, score=unmarked * number)
+        )
+    wins.sort(key=attrgetter("turn", "board"))
+    return wins
+
+
 def yield_data(filename: str) -> Iterator[str]:
     with open(file=filename, mode="r") as read_file:
         for line in read_file:
@@ -121,16 +368,54 @@ def get_boards(data: Iterator[str]) -> list[Board]:
     return boards
 
 
+def read_board_store(filename: str) -> tuple[list[int], BoardStore]:
+    with map_file(filename) as data:
+        numbers_end = data.find(b"\n")
+        if numbers_end < 0:
+            numbers_end = len(data)
+        numbers = parse_integers(data[:numbers_end], separator=b",", table=COMMA_TABLE)
+        boards_start = numbers_end + 1
+        while data[boards_start : boards_start + 1].isspace():
+            boards_start += 1
+        row_end = data.find(b"\n", boards_start)
+        first_row = data[boards_start : row_end if row_end >= 0 else len(data)]
+        size = len(first_row.split()) or BOARD_SIZE
+        cells = parse_integers(data, start=boards_start)
+    if len(cells) % (size * size):
+        raise ValueError(f"{filename} ends with a partial {size}x{size} board")
+    return numbers.tolist(), BoardStore(size=size, cells=cells)
+
+
+def create_bingo(filename: str) -> Bingo:
+    numbers, store = read_board_store(filename)
+    return Bingo(numbers=numbers, boards=list(store))
+
+
+def create_bingo_engine(filename: str) -> BingoEngine:
+    bingo = create_bingo(filename)
+    return BingoEngine(numbers=bingo.numbers, boards=bingo.boards)
+
+
+def rank_bingo(filename: str) -> list[Win]:
+    bingo = create_bingo(filename)
+    return rank_boards(numbers=bingo.numbers, boards=bingo.boards)
+
+
+def part_one(filename: str) -> Optional[int]:
+    ranking = rank_bingo(filename)
+    return ranking[0].score if ranking else None
+
+
+def part_two(filename: str) -> Optional[int]:
+    ranking = rank_bingo(filename)
+    return ranking[-1].score if ranking else None
+
+
 def main() -> None:
-    data = yield_data(FILENAME)
-    numbers = get_numbers(data)
-    boards = get_boards(data)
-    bingo = Bingo(numbers=numbers, boards=boards)
-    if score := bingo.winning_board_score():
+    if score := part_one(FILENAME):
         print(f"First winning score: {score}")
 
-    bingo = Bingo(numbers=numbers, boards=boards)
-    if score := bingo.last_winning_board_score():
+    if score := part_two(FILENAME):
         print(f"Last winning score: {score}")
 
 
@@ -1,10 +1,34 @@
-from typing import Iterator, NamedTuple
+import os
+from typing import Iterable, Iterator, NamedTuple, Optional
 from dataclasses import dataclass, field
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from enum import Enum, auto
+from itertools import combinations
+from math import inf
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from loader import read_arrow_pairs
 
 
 FILENAME = "day5_data.txt"
 
 GRID_EMPTY = 0
+DENSE_CELLS_PER_VENT_POINT = 4
+RASTER_INCREMENT = bytes(min(count + 1, 255) for count in range(256))
+TILE_SIZE = 512
+PIECE_FIELDS = 5
+
+
+class GridBackend(Enum):
+    AUTO = auto()
+    DENSE = auto()
+    RASTER = auto()
+    SPARSE = auto()
+    GEOMETRY = auto()
+    TILED = auto()
 
 
 class Point(NamedTuple):
@@ -12,6 +36,50 @@ class Point(NamedTuple):
     y: int = 0
 
 
+class LineFamily(Enum):
+    # lines of a family are a * x + b * y == constant
+    HORIZONTAL = (0, 1)
+    VERTICAL = (1, 0)
+    DIAGONAL = (1, -1)
+    ANTI_DIAGONAL = (1, 1)
+
+    def constant(self, point: Point) -> int:
+        a, b = self.value
+        return a * point.x + b * point.y
+
+    def position(self, point: Point) -> int:
+        return point.y if self == LineFamily.VERTICAL else point.x
+
+    def point(self, constant: int, position: int) -> Point:
+        if self == LineFamily.VERTICAL:
+            return Point(x=constant, y=position)
+        a, b = self.value
+        return Point(x=position, y=(constant - a * position) * b)
+
+    def crossing(
+        self, constant: int, other: "LineFamily", other_constant: int
+    ) -> Optional[Point]:
+        a, b = self.value
+        other_a, other_b = other.value
+        determinant = a * other_b - b * other_a
+        x, x_remainder = divmod(constant * other_b - b * other_constant, determinant)
+        y, y_remainder = divmod(a * other_constant - other_a * constant, determinant)
+        if x_remainder or y_remainder:
+            return None
+        return Point(x=x, y=y)
+
+
+Interval = tuple[int, int]
+
+
+def steps_in_tile(position: int, direction: int, tile_size: int) -> float:
+    if direction > 0:
+        return tile_size - position % tile_size
+    if direction < 0:
+        return position % tile_size + 1
+    return inf
+
+
 @dataclass
 class Vent:
     start: Point
@@ -82,6 +150,53 @@ class Vent:
             for x, y in zip(range(start_x, end_x - 1, -1), range(start_y, end_y + 1))
         ]
 
+    def family(self) -> Optional[LineFamily]:
+        for family in LineFamily:
+            if family.constant(self.start) == family.constant(self.end):
+                return family
+        return None
+
+    def length(self) -> int:
+        return max(abs(self.end.x - self.start.x), abs(self.end.y - self.start.y)) + 1
+
+    def cell_keys(self, stride: int) -> range:
+        dx = self.end.x - self.start.x
+        dy = self.end.y - self.start.y
+        if dx and dy and abs(dx) != abs(dy):
+            return range(0)
+        step = (dy > 0) - (dy < 0)
+        step = step * stride + (dx > 0) - (dx < 0)
+        start = self.start.y * stride + self.start.x
+        if not step:
+            return range(start, start + 1)
+        return range(start, start + step * self.length(), step)
+
+    def cell_slice(self, stride: int) -> slice:
+        keys = self.cell_keys(stride)
+        if keys.step < 0:
+            keys = keys[::-1]
+        return slice(keys.start, keys.stop, keys.step)
+
+    def tile_pieces(self, tile_size: int) -> Iterator[tuple[int, int, int, int, int]]:
+        # (x, y, dx, dy, length) runs of the vent that stay inside one tile
+        if self.family() is None:
+            return None
+        dx = (self.end.x > self.start.x) - (self.end.x < self.start.x)
+        dy = (self.end.y > self.start.y) - (self.end.y < self.start.y)
+        x, y = self.start
+        remaining = self.length()
+        while remaining:
+            run = min(
+                remaining,
+                steps_in_tile(x, dx, tile_size),
+                steps_in_tile(y, dy, tile_size),
+            )
+            yield x, y, dx, dy, run
+            x += dx * run
+            y += dy * run
+            remaining -= run
+        return None
+
     def points(self) -> list[Point]:
         if self._is_horizontal():
             return self._horizontal_points()
@@ -115,12 +230,241 @@ def get_vents(data: Iterator[str], angled: bool = False) -> list[Vent]:
     return vents
 
 
+def load_vents(filename: str, angled: bool = False) -> list[Vent]:
+    coordinates = read_arrow_pairs(filename)
+    vents: list[Vent] = []
+    for x1, y1, x2, y2 in zip(*[iter(coordinates)] * 4):
+        vent = Vent(start=Point(x=x1, y=y1), end=Point(x=x2, y=y2))
+        if not angled and vent.angled():
+            continue
+        vents.append(vent)
+    return vents
+
+
+def add_interval(intervals: list[Interval], low: int, high: int) -> None:
+    if intervals and intervals[-1][1] + 1 >= low:
+        intervals[-1] = (intervals[-1][0], high)
+    else:
+        intervals.append((low, high))
+
+
+def coverage(intervals: Iterable[Interval]) -> tuple[list[Interval], list[Interval]]:
+    changes: Counter = Counter()
+    for low, high in intervals:
+        changes[low] += 1
+        changes[high + 1] -= 1
+    union: list[Interval] = []
+    overlaps: list[Interval] = []
+    depth = 0
+    previous_position = 0
+    for position in sorted(changes):
+        if depth >= 1:
+            add_interval(union, previous_position, position - 1)
+        if depth >= 2:
+            add_interval(overlaps, previous_position, position - 1)
+        depth += changes[position]
+        previous_position = position
+    return union, overlaps
+
+
+INSERT, QUERY, REMOVE = range(3)
+
+
+@dataclass
+class VentGeometry:
+    vents: list[Vent] = field(default_factory=list)
+    unions: dict[LineFamily, dict[int, list[Interval]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    overlaps: dict[LineFamily, dict[int, list[Interval]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        lines: dict[LineFamily, dict[int, list[Interval]]] = {
+            family: defaultdict(list) for family in LineFamily
+        }
+        for vent in self.vents:
+            family = vent.family()
+            if family is None:
+                continue
+            positions = sorted((family.position(vent.start), family.position(vent.end)))
+            lines[family][family.constant(vent.start)].append(tuple(positions))
+
+        for family, family_lines in lines.items():
+            self.unions[family] = {}
+            self.overlaps[family] = {}
+            for constant, intervals in family_lines.items():
+                union, overlaps = coverage(intervals)
+                self.unions[family][constant] = union
+                if overlaps:
+                    self.overlaps[family][constant] = overlaps
+
+    def crossings(self, family: LineFamily, other: LineFamily) -> Iterator[Point]:
+        # in (other constant, family constant) coordinates the lines of both
+        # families are axis aligned, so this is an orthogonal sweep line
+        events: list[tuple[int, int, object]] = []
+        for constant, intervals in self.unions[family].items():
+            for low, high in intervals:
+                ends = sorted(
+                    other.constant(family.point(constant, position))
+                    for position in (low, high)
+                )
+                events.append((ends[0], INSERT, constant))
+                events.append((ends[1], REMOVE, constant))
+        for other_constant, intervals in self.unions[other].items():
+            for low, high in intervals:
+                ends = sorted(
+                    family.constant(other.point(other_constant, position))
+                    for position in (low, high)
+                )
+                events.append((other_constant, QUERY, tuple(ends)))
+        events.sort(key=lambda event: event[:2])
+
+        active: list[int] = []
+        for other_constant, kind, payload in events:
+            if kind == INSERT:
+                insort(active, payload)
+            elif kind == REMOVE:
+                del active[bisect_left(active, payload)]
+            else:
+                low, high = payload
+                start = bisect_left(active, low)
+                stop = bisect_right(active, high)
+                for constant in active[start:stop]:
+                    point = family.crossing(constant, other, other_constant)
+                    if point is not None:
+                        yield point
+
+    def in_overlap(self, family: LineFamily, point: Point) -> bool:
+        intervals = self.overlaps[family].get(family.constant(point), [])
+        position = family.position(point)
+        index = bisect_right(intervals, (position, inf)) - 1
+        return index >= 0 and intervals[index][1] >= position
+
+    def overlap(self) -> int:
+        total = sum(
+            high - low + 1
+            for lines in self.overlaps.values()
+            for intervals in lines.values()
+            for low, high in intervals
+        )
+        crossing_points: set[Point] = set()
+        for family, other in combinations(LineFamily, 2):
+            crossing_points.update(self.crossings(family, other))
+        # a crossing point is already counted once for every family whose
+        # collinear overlaps contain it
+        for point in crossing_points:
+            total += 1 - sum(self.in_overlap(family, point) for family in LineFamily)
+        return total
+
+
+class TileTask(NamedTuple):
+    shared_name: str
+    x: int
+    y: int
+    width: int
+    height: int
+    start: int
+    stop: int
+
+
+def count_tile_overlap(task: TileTask) -> int:
+    shared_memory = SharedMemory(name=task.shared_name)
+    raster = bytearray(task.width * task.height)
+    try:
+        with shared_memory.buf.cast("q") as pieces:
+            for index in range(task.start, task.stop, PIECE_FIELDS):
+                x, y, dx, dy, run = pieces[index : index + PIECE_FIELDS]
+                start = (y - task.y) * task.width + (x - task.x)
+                step = dy * task.width + dx
+                step = step or 1
+                cells = range(start, start + step * run, step)
+                if step < 0:
+                    cells = cells[::-1]
+                tile_slice = slice(cells.start, cells.stop, cells.step)
+                raster[tile_slice] = raster[tile_slice].translate(RASTER_INCREMENT)
+    finally:
+        shared_memory.close()
+    return len(raster) - raster.count(0) - raster.count(1)
+
+
+def bottom_right_point(vents: list[Vent]) -> Point:
+    x = 0
+    y = 0
+    for vent in vents:
+        x = max(x, vent.start.x, vent.end.x)
+        y = max(y, vent.start.y, vent.end.y)
+    return Point(x=x, y=y)
+
+
+def tiled_overlap(
+    vents: list[Vent], tile_size: int = TILE_SIZE, workers: Optional[int] = None
+) -> int:
+    tiles: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for vent in vents:
+        for piece in vent.tile_pieces(tile_size):
+            x, y = piece[:2]
+            tiles[(x // tile_size, y // tile_size)].extend(piece)
+    if not tiles:
+        return 0
+
+    pieces = array("q")
+    bounds: list[tuple[int, int, int, int]] = []
+    for (tile_x, tile_y), tile_pieces in tiles.items():
+        bounds.append((tile_x, tile_y, len(pieces), len(pieces) + len(tile_pieces)))
+        pieces.extend(tile_pieces)
+
+    # edge tiles, and tiles bigger than the whole field, stop at its last cell
+    bottom_right = bottom_right_point(vents)
+    shared_memory = SharedMemory(create=True, size=len(pieces) * pieces.itemsize)
+    try:
+        shared_memory.buf[: len(pieces) * pieces.itemsize] = pieces.tobytes()
+        tasks = [
+            TileTask(
+                shared_name=shared_memory.name,
+                x=tile_x * tile_size,
+                y=tile_y * tile_size,
+                width=min(tile_size, bottom_right.x + 1 - tile_x * tile_size),
+                height=min(tile_size, bottom_right.y + 1 - tile_y * tile_size),
+                start=start,
+                stop=stop,
+            )
+            for tile_x, tile_y, start, stop in bounds
+        ]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            return sum(map(count_tile_overlap, tasks))
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(count_tile_overlap, tasks, chunksize=chunksize))
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
 @dataclass
 class OceanFloor:
     vents: list[Vent] = field(default_factory=list)
+    backend: GridBackend = GridBackend.AUTO
+    tile_size: int = TILE_SIZE
+    workers: Optional[int] = None
     grid: list[list[int]] = field(default_factory=list, init=False)
+    cells: Counter = field(default_factory=Counter, init=False, repr=False)
+    stride: int = field(default=0, init=False, repr=False)
+    geometry: Optional[VentGeometry] = field(default=None, init=False, repr=False)
+    raster: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    tiled_count: int = field(default=0, init=False, repr=False)
 
     def overlap(self) -> int:
+        if self.backend == GridBackend.GEOMETRY and self.geometry:
+            return self.geometry.overlap()
+        if self.backend == GridBackend.TILED:
+            return self.tiled_count
+        if self.backend == GridBackend.RASTER:
+            return len(self.raster) - self.raster.count(0) - self.raster.count(1)
+        if self.backend == GridBackend.SPARSE:
+            return sum(1 for count in self.cells.values() if count > 1)
         count = 0
         for row in self.grid:
             for col in row:
@@ -129,9 +473,52 @@ class OceanFloor:
         return count
 
     def update_grid(self):
+        if self.backend == GridBackend.AUTO:
+            self.backend = self.choose_backend()
+        if self.backend == GridBackend.SPARSE:
+            self.update_cells()
+            return None
+        if self.backend == GridBackend.GEOMETRY:
+            self.geometry = VentGeometry(self.vents)
+            return None
+        if self.backend == GridBackend.RASTER:
+            self.update_raster()
+            return None
+        if self.backend == GridBackend.TILED:
+            self.tiled_count = tiled_overlap(
+                self.vents, tile_size=self.tile_size, workers=self.workers
+            )
+            return None
         self.create_grid()
         for vent in self.vents:
             self._add_vent_to_grid(vent)
+        return None
+
+    def choose_backend(self) -> GridBackend:
+        bottom_right = self._bottom_right_point()
+        area = (bottom_right.x + 1) * (bottom_right.y + 1)
+        vent_points = sum(vent.length() for vent in self.vents)
+        if area > DENSE_CELLS_PER_VENT_POINT * vent_points:
+            return GridBackend.SPARSE
+        return GridBackend.RASTER
+
+    def update_cells(self) -> None:
+        self.stride = self._bottom_right_point().x + 1
+        self.cells = Counter()
+        for vent in self.vents:
+            self.cells.update(vent.cell_keys(self.stride))
+
+    def update_raster(self) -> None:
+        # each vent is an evenly stepped slice of the flattened grid, so it
+        # is added with one slice read, translate and slice write
+        bottom_right = self._bottom_right_point()
+        self.stride = bottom_right.x + 1
+        self.raster = bytearray(self.stride * (bottom_right.y + 1))
+        for vent in self.vents:
+            if vent.family() is None:
+                continue
+            cells = vent.cell_slice(self.stride)
+            self.raster[cells] = self.raster[cells].translate(RASTER_INCREMENT)
 
     def create_grid(self) -> None:
         bottom_right = self._bottom_right_point()
@@ -144,36 +531,50 @@ class OceanFloor:
             self.grid[point.y][point.x] += 1
 
     def _bottom_right_point(self) -> Point:
-        x = 0
-        y = 0
-        for vent in self.vents:
-            x = max(x, vent.start.x, vent.end.x)
-            y = max(y, vent.start.y, vent.end.y)
-        return Point(x=x, y=y)
+        return bottom_right_point(self.vents)
 
     def __repr__(self) -> str:
+        if self.backend == GridBackend.RASTER:
+            return "\n".join(
+                "".join(str(count) for count in self.raster[y : y + self.stride])
+                for y in range(0, len(self.raster), self.stride)
+            )
+        if self.backend == GridBackend.SPARSE:
+            bottom_right = self._bottom_right_point()
+            return "\n".join(
+                "".join(
+                    str(self.cells[y * self.stride + x]) for x in range(self.stride)
+                )
+                for y in range(bottom_right.y + 1)
+            )
         return "\n".join("".join(str(number) for number in row) for row in self.grid)
 
 
 def horizontal_and_vertical_overlap(filename: str) -> int:
-    data = yield_data(filename)
-    vents = get_vents(data=data)
+    vents = load_vents(filename)
     ocean_floor = OceanFloor(vents)
     ocean_floor.update_grid()
     return ocean_floor.overlap()
 
 
 def all_overlap(filename: str) -> int:
-    data = yield_data(filename)
-    vents = get_vents(data=data, angled=True)
+    vents = load_vents(filename, angled=True)
     ocean_floor = OceanFloor(vents)
     ocean_floor.update_grid()
     return ocean_floor.overlap()
 
 
+def part_one(filename: str) -> int:
+    return horizontal_and_vertical_overlap(filename)
+
+
+def part_two(filename: str) -> int:
+    return all_overlap(filename)
+
+
 def main() -> None:
-    print(f"Horizontal & Vertical Overlap: {horizontal_and_vertical_overlap(FILENAME)}")
-    print(f"All Overlap: {all_overlap(FILENAME)}")
+    print(f"Horizontal & Vertical Overlap: {part_one(FILENAME)}")
+    print(f"All Overlap: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
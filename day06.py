@@ -1,18 +1,32 @@
+import json
 from dataclasses import dataclass, field
-from typing import Deque, Iterator
-from collections import deque
+from pathlib import Path
+from typing import Deque, Generic, Iterable, Iterator, Optional, TypeVar
+from collections import OrderedDict, deque
+
+from loader import read_comma_integers
 
 FILENAME = "day6_data.txt"
+RESPONSES_FILENAME = "day6_responses.json"
 
 
 NEW_BORN_INTERVAL = 8
+RESET_INTERVAL = 6
+TIMERS = NEW_BORN_INTERVAL + 1
+TABLE_DAYS = (80, 256)
+# each day count cache may hold this many bits of ints, about 64 MiB
+CACHED_RESPONSE_BITS = 1 << 29
+CACHED_POWER_BITS = 1 << 29
+# one byte per fish, so this is roughly the memory the timers may take up
+MEMORY_BUDGET = 1 << 28
+DAY_TABLE = bytes((RESET_INTERVAL,)) + bytes(range(255))
+
+Matrix = list[list[int]]
+Value = TypeVar("Value")
 
 
 def yield_data(filename: str) -> Iterator[int]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            for number in line.strip().split(","):
-                yield int(number)
+    return iter(read_comma_integers(filename))
 
 
 @dataclass
@@ -56,6 +70,51 @@ class Sea:
         return ",".join(str(fish.timer) for fish in self.fishes)
 
 
+@dataclass
+class ArraySea:
+    timers: bytearray = field(default_factory=bytearray)
+    memory_budget: int = MEMORY_BUDGET
+    counts: Optional["EffiecientSea"] = field(default=None, init=False, repr=False)
+
+    def add_fish(self, timer: int = NEW_BORN_INTERVAL) -> None:
+        if self.counts is not None:
+            self.counts.add_fish(interval=timer)
+            return None
+        self.timers.append(timer)
+
+    def new_day(self) -> None:
+        if self.counts is not None:
+            self.counts.new_day()
+            return None
+        spawning = self.timers.count(0)
+        if len(self.timers) + spawning > self.memory_budget:
+            self.switch_to_counting()
+            self.counts.new_day()
+            return None
+        self.timers = self.timers.translate(DAY_TABLE)
+        self.timers.extend(bytes((NEW_BORN_INTERVAL,)) * spawning)
+
+    def switch_to_counting(self) -> None:
+        self.counts = EffiecientSea()
+        for timer in range(TIMERS):
+            self.counts.interval_days[timer] = self.timers.count(timer)
+        self.timers = bytearray()
+
+    @property
+    def traced(self) -> bool:
+        return self.counts is None
+
+    def fish_count(self) -> int:
+        if self.counts is not None:
+            return self.counts.fish_count()
+        return len(self.timers)
+
+    def __repr__(self) -> str:
+        if self.counts is not None:
+            return f"ArraySea(counts={list(self.counts.interval_days)})"
+        return ",".join(map(str, self.timers))
+
+
 @dataclass
 class EffiecientSea:
     interval_days: Deque[int] = field(default_factory=deque, init=False)
@@ -79,31 +138,199 @@ class EffiecientSea:
         return sum(fish for fish in self.interval_days)
 
 
-def main():
-    data = yield_data(filename=FILENAME)
-    sea = Sea()
-    effiecient_sea = EffiecientSea()
+def identity_matrix(size: int = TIMERS) -> Matrix:
+    return [[int(row == column) for column in range(size)] for row in range(size)]
+
+
+def transition_matrix() -> Matrix:
+    # column j holds where the fish with timer j are the next day
+    matrix = [[0] * TIMERS for _ in range(TIMERS)]
+    for timer in range(1, TIMERS):
+        matrix[timer - 1][timer] = 1
+    matrix[RESET_INTERVAL][0] = 1
+    matrix[NEW_BORN_INTERVAL][0] = 1
+    return matrix
+
+
+def multiply(matrix: Matrix, other: Matrix) -> Matrix:
+    columns = list(zip(*other))
+    return [
+        [sum(map(int.__mul__, row, column)) for column in columns] for row in matrix
+    ]
+
+
+def matrix_power(matrix: Matrix, exponent: int) -> Matrix:
+    result = identity_matrix(len(matrix))
+    while exponent:
+        if exponent & 1:
+            result = multiply(result, matrix)
+        matrix = multiply(matrix, matrix)
+        exponent >>= 1
+    return result
+
+
+def timer_counts(timers: Iterable[int]) -> list[int]:
+    counts = [0] * TIMERS
+    for timer in timers:
+        counts[timer] += 1
+    return counts
+
+
+def int_bits(values: Iterable[int]) -> int:
+    return sum(value.bit_length() for value in values)
+
+
+@dataclass
+class SizedCache(Generic[Value]):
+    # least recently used entries go first once the ints held pass max_bits
+    max_bits: int
+    entries: OrderedDict[int, Value] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    entry_bits: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    bits: int = field(default=0, init=False)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.entries
+
+    def get(self, key: int) -> Optional[Value]:
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: int, value: Value, bits: int) -> None:
+        if key in self.entries or bits > self.max_bits:
+            return None
+        self.entries[key] = value
+        self.entry_bits[key] = bits
+        self.bits += bits
+        while self.bits > self.max_bits:
+            evicted, _ = self.entries.popitem(last=False)
+            self.bits -= self.entry_bits.pop(evicted)
+        return None
+
 
+@dataclass
+class LanternfishProjector:
+    max_cached_bits: int = CACHED_POWER_BITS
+    powers: SizedCache[Matrix] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.powers = SizedCache(max_bits=self.max_cached_bits)
+
+    def days_matrix(self, days: int) -> Matrix:
+        matrix = self.powers.get(days)
+        if matrix is None:
+            matrix = matrix_power(transition_matrix(), days)
+            self.powers.put(days, matrix, bits=sum(map(int_bits, matrix)))
+        return matrix
+
+    def project(self, counts: list[int], days: int) -> list[int]:
+        return self.project_many([counts], days)[0]
+
+    def project_many(self, schools: list[list[int]], days: int) -> list[list[int]]:
+        # every school is one column of a single matrix product
+        columns = [list(column) for column in zip(*schools)]
+        projected = multiply(self.days_matrix(days), columns)
+        return [list(school) for school in zip(*projected)]
+
+    def fish_count(self, counts: list[int], days: int) -> int:
+        return sum(self.project(counts, days))
+
+    def fish_counts(self, schools: list[list[int]], days: int) -> list[int]:
+        return [sum(school) for school in self.project_many(schools, days)]
+
+
+def response_vector(days: int) -> list[int]:
+    # entry t is the school grown from a single fish with timer t
+    return [sum(column) for column in zip(*matrix_power(transition_matrix(), days))]
+
+
+def dot(counts: Iterable[int], response: Iterable[int]) -> int:
+    return sum(map(int.__mul__, counts, response))
+
+
+@dataclass
+class ResponseTable:
+    filename: Path = Path(RESPONSES_FILENAME)
+    table_days: tuple[int, ...] = TABLE_DAYS
+    max_cached_bits: int = CACHED_RESPONSE_BITS
+    table: dict[int, list[int]] = field(default_factory=dict, init=False)
+    cache: SizedCache[list[int]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.cache = SizedCache(max_bits=self.max_cached_bits)
+
+    def load(self) -> None:
+        if self.filename.exists():
+            stored: dict[str, list[str]] = json.loads(self.filename.read_text())
+            for days, vector in stored.items():
+                self.table[int(days)] = [int(value, 16) for value in vector]
+        missing = [days for days in self.table_days if days not in self.table]
+        for days in missing:
+            self.table[days] = response_vector(days)
+        if missing:
+            self.save()
+
+    def save(self) -> None:
+        # hex strings, as str(int) is refused past 4300 digits (about 114k days)
+        table = {
+            str(days): [format(value, "x") for value in vector]
+            for days, vector in sorted(self.table.items())
+        }
+        self.filename.write_text(json.dumps(table, indent=2))
+
+    def response(self, days: int) -> list[int]:
+        if days in self.table:
+            return self.table[days]
+        vector = self.cache.get(days)
+        if vector is None:
+            vector = response_vector(days)
+            self.cache.put(days, vector, bits=int_bits(vector))
+        return vector
+
+    def fish_count(self, counts: Iterable[int], days: int) -> int:
+        return dot(counts, self.response(days))
+
+
+def fish_count_after(filename: str, days: int) -> int:
+    data = yield_data(filename=filename)
+    effiecient_sea = EffiecientSea()
     for interval in data:
-        sea.add_fish(LanternFish(home=sea, timer=interval, new_born=False))
         effiecient_sea.add_fish(interval=interval)
+    for _ in range(days):
+        effiecient_sea.new_day()
+    return effiecient_sea.fish_count()
+
+
+def projected_fish_count(filename: str, days: int) -> int:
+    counts = timer_counts(yield_data(filename=filename))
+    return LanternfishProjector().fish_count(counts=counts, days=days)
+
+
+def part_one(filename: str) -> int:
+    return projected_fish_count(filename=filename, days=80)
+
+
+def part_two(filename: str) -> int:
+    return projected_fish_count(filename=filename, days=256)
+
+
+def main():
+    data = yield_data(filename=FILENAME)
+    sea = ArraySea()
+    for interval in data:
+        sea.add_fish(timer=interval)
 
     DAYS_80 = 80
     for day in range(1, DAYS_80 + 1):
         sea.new_day()
-        effiecient_sea.new_day()
     print(f"Fish in the sea after {DAYS_80} days: {sea.fish_count()}")
-    print(
-        f"Fish in the effiecient_sea after {DAYS_80} days: {effiecient_sea.fish_count()}"
-    )
+    print(f"Fish in the effiecient_sea after {DAYS_80} days: {part_one(FILENAME)}")
 
     DAYS_256 = 256
-    for day in range(DAYS_80 + 1, DAYS_256 + 1):
-        effiecient_sea.new_day()
-
-    print(
-        f"Fish in the effiecient_sea after {DAYS_256} days: {effiecient_sea.fish_count()}"
-    )
+    print(f"Fish in the effiecient_sea after {DAYS_256} days: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
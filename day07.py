@@ -1,18 +1,27 @@
-from typing import Iterator, NamedTuple
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
 from dataclasses import dataclass, field
-from operator import attrgetter
-from itertools import accumulate
-from collections import deque
+from operator import attrgetter, mul, sub
+from itertools import accumulate, repeat
+from collections import Counter, deque
 from functools import cache
 
+from loader import COMMA_TABLE, iter_windows, map_file, read_comma_integers
+
 FILENAME = "day7_data.txt"
 
+FuelCurve = Callable[[int], int]
+
 
 def yield_data(filename: str) -> Iterator[int]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            for number in line.strip().split(","):
-                yield int(number)
+    return iter(read_comma_integers(filename))
+
+
+def linear_fuel(distance: int) -> int:
+    return distance
+
+
+def triangular_fuel(distance: int) -> int:
+    return distance * (distance + 1) // 2
 
 
 @cache
@@ -66,16 +75,127 @@ def cheapest_x_position(crabsubs: CrabSubs, basic_fuel_cost: bool = True) -> Fue
     return min(fuel_x_costs, key=attrgetter("fuel"))
 
 
+@dataclass
+class CrabHistogram:
+    positions: list[int]
+    counts: list[int]
+    count: int = field(init=False, repr=False)
+    total: int = field(init=False, repr=False)
+    square_total: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # only 1 to 3 candidates are ever costed, so each one walks the
+        # positions once rather than keeping prefix sums around
+        self.count = sum(self.counts)
+        self.total = sum(map(mul, self.positions, self.counts))
+        self.square_total = sum(x * x * count for x, count in self.items())
+
+    def items(self) -> Iterator[tuple[int, int]]:
+        return zip(self.positions, self.counts)
+
+    def median(self) -> int:
+        middle = (self.count - 1) // 2
+        for x, crabs in zip(self.positions, accumulate(self.counts)):
+            if crabs > middle:
+                return x
+        raise ValueError("no crabs to align")
+
+    def distance_sum(self, x: int) -> int:
+        distances = map(abs, map(sub, self.positions, repeat(x)))
+        return sum(map(mul, distances, self.counts))
+
+    def square_distance_sum(self, x: int) -> int:
+        return self.square_total - 2 * x * self.total + self.count * x * x
+
+    def linear_cost(self, x: int) -> FuelXCost:
+        return FuelXCost(x=x, fuel=self.distance_sum(x))
+
+    def triangular_cost(self, x: int) -> FuelXCost:
+        # d * (d + 1) / 2 summed over every crab
+        fuel = (self.square_distance_sum(x) + self.distance_sum(x)) // 2
+        return FuelXCost(x=x, fuel=fuel)
+
+    def mean_neighbourhood(self) -> range:
+        # the triangular optimum is always within half a step of the mean
+        low = self.total // self.count
+        return range(low - 1, low + 2)
+
+
+def count_positions(windows: Iterable[bytes]) -> Counter[int]:
+    counts: Counter[int] = Counter()
+    for window in windows:
+        counts.update(map(int, window.translate(COMMA_TABLE).split()))
+    return counts
+
+
+def histogram_crabs(counts: Counter[int]) -> CrabHistogram:
+    positions = sorted(counts)
+    return CrabHistogram(positions=positions, counts=[counts[x] for x in positions])
+
+
+def read_crab_histogram(filename: str) -> CrabHistogram:
+    with map_file(filename) as data:
+        windows = iter_windows(data, separator=b",")
+        return histogram_crabs(count_positions(windows))
+
+
+def aligned_x_position(crabs: CrabHistogram, basic_fuel_cost: bool = True) -> FuelXCost:
+    if basic_fuel_cost:
+        return crabs.linear_cost(crabs.median())
+    costs = map(crabs.triangular_cost, crabs.mean_neighbourhood())
+    return min(costs, key=attrgetter("fuel"))
+
+
+@dataclass
+class AlignmentEngine:
+    positions: Sequence[int]
+    fuel_curve: FuelCurve = linear_fuel
+    # per crab fuel multipliers, for crabs that are heavier or burn more
+    weights: Optional[Sequence[int]] = None
+
+    @classmethod
+    def from_histogram(
+        cls, crabs: CrabHistogram, fuel_curve: FuelCurve = linear_fuel
+    ) -> "AlignmentEngine":
+        weights = crabs.counts
+        return cls(positions=crabs.positions, fuel_curve=fuel_curve, weights=weights)
+
+    def fuel(self, x: int) -> int:
+        distances = map(abs, map(sub, self.positions, repeat(x)))
+        costs = map(self.fuel_curve, distances)
+        if self.weights is None:
+            return sum(costs)
+        return sum(map(mul, self.weights, costs))
+
+    def cost(self, x: int) -> FuelXCost:
+        return FuelXCost(x=x, fuel=self.fuel(x))
+
+    def cheapest(self) -> FuelXCost:
+        # a convex fuel curve makes the total convex in x, so ternary search
+        # on the slope between neighbours narrows in on the minimum
+        low, high = min(self.positions), max(self.positions)
+        while low < high:
+            middle = (low + high) // 2
+            if self.fuel(middle) <= self.fuel(middle + 1):
+                high = middle
+            else:
+                low = middle + 1
+        return self.cost(low)
+
+
+def part_one(filename: str) -> int:
+    crabs = read_crab_histogram(filename=filename)
+    return aligned_x_position(crabs).fuel
+
+
+def part_two(filename: str) -> int:
+    crabs = read_crab_histogram(filename=filename)
+    return aligned_x_position(crabs, basic_fuel_cost=False).fuel
+
+
 def main():
-    data = yield_data(filename=FILENAME)
-    points = get_points(data)
-    crabsubs = CrabSubs(list(points))
-    print(f"Part one fuel cost: {cheapest_x_position(crabsubs)}")
-
-    data = yield_data(filename=FILENAME)
-    points = get_points(data)
-    crabsubs = CrabSubs(list(points))
-    print(f"Part two fuel cost: {cheapest_x_position(crabsubs,basic_fuel_cost=False)}")
+    print(f"Part one fuel cost: {part_one(FILENAME)}")
+    print(f"Part two fuel cost: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,28 @@
-from typing import Iterator, Optional
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
 from dataclasses import astuple, dataclass, InitVar, field, astuple
-from itertools import cycle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cache
+from itertools import cycle, permutations
+from math import factorial
+from operator import itemgetter
+
+from loader import map_file
 
 
 FILENAME = "day8_data.txt"
+CHUNKS_PER_WORKER = 4
+DIGITS = list(range(10))
+
+SEGMENTS = "abcdefg"
+SEGMENT_BITS = {segment: 1 << index for index, segment in enumerate(SEGMENTS)}
+WIRINGS = factorial(len(SEGMENTS))
+# digits that are the only ones lit with that many segments
+UNIQUE_SEGMENT_COUNTS = {2: 1, 4: 4, 3: 7, 7: 8}
+# lit segments for every 7-bit mask, as int.bit_count needs Python 3.10
+MASK_SEGMENT_COUNTS = [bin(mask).count("1") for mask in range(1 << len(SEGMENTS))]
 
 
 def iter_data(filename: str) -> Iterator[str]:
@@ -121,7 +140,6 @@ TEST_ENTRY = Entry(
 
 
 def iter_entrys(data: Iterator[str]) -> Iterator[Entry]:
-    entrys: list[Entry] = []
     for line in data:
         unique_displays, output_displays = line.split("|")
         entry = Entry(
@@ -129,7 +147,6 @@ def iter_entrys(data: Iterator[str]) -> Iterator[Entry]:
             unique_displays=[Display(input=input) for input in unique_displays.split()],
             output_displays=[Display(input=input) for input in output_displays.split()],
         )
-        entrys.append(entry)
         yield entry
 
 
@@ -203,39 +220,245 @@ def get_display_convertor(entry: Entry) -> dict[Display, Display]:
     return convertor
 
 
-def part_one(filename: str) -> None:
-    data = iter_data(filename)
-    entrys = iter_entrys(data)
-    count = 0
-    for entry in entrys:
-        for display in entry.output_displays:
-            if display.segments_count() in (
-                DISPLAY1.segments_count(),
-                DISPLAY4.segments_count(),
-                DISPLAY7.segments_count(),
-                DISPLAY8.segments_count(),
-            ):
-                count += 1
-    print(f"Part one: {count}")
-
-
-def part_two(filename: str) -> None:
-    data = iter_data(filename)
-    entrys = iter_entrys(data)
-    count = 0
-    for entry in entrys:
-        number = ""
-        convertor = get_display_convertor(entry)
-        for display in entry.output_displays:
-            number = f"{number}{convertor[display].number}"
-        count += int(number)
-
-    print(f"Part two: {count}")
+class MaskEntry(NamedTuple):
+    unique_masks: list[int]
+    output_masks: list[int]
+
+
+@cache
+def pattern_mask(pattern: str) -> int:
+    return sum(SEGMENT_BITS[segment] for segment in pattern)
+
+
+def display_mask(display: Display) -> int:
+    return pattern_mask("".join(display.segments_on()))
+
+
+def mask_display(mask: int, number: Optional[int] = None) -> Display:
+    pattern = "".join(segment for segment in SEGMENTS if mask & SEGMENT_BITS[segment])
+    return Display(input=pattern, number=number)
+
+
+def parse_mask_entry(line: str) -> MaskEntry:
+    unique_patterns, output_patterns = line.split("|")
+    return MaskEntry(
+        unique_masks=[pattern_mask(pattern) for pattern in unique_patterns.split()],
+        output_masks=[pattern_mask(pattern) for pattern in output_patterns.split()],
+    )
+
+
+def entry_masks(entry: Entry) -> MaskEntry:
+    return MaskEntry(
+        unique_masks=[display_mask(display) for display in entry.unique_displays],
+        output_masks=[display_mask(display) for display in entry.output_displays],
+    )
+
+
+def mask_digits(unique_masks: list[int]) -> dict[int, int]:
+    one = four = 0
+    for mask in unique_masks:
+        if MASK_SEGMENT_COUNTS[mask] == 2:
+            one = mask
+        elif MASK_SEGMENT_COUNTS[mask] == 4:
+            four = mask
+    digits: dict[int, int] = {}
+    for mask in unique_masks:
+        count = MASK_SEGMENT_COUNTS[mask]
+        if count in UNIQUE_SEGMENT_COUNTS:
+            digits[mask] = UNIQUE_SEGMENT_COUNTS[count]
+        elif count == 5:
+            if mask & one == one:
+                digits[mask] = 3
+            elif MASK_SEGMENT_COUNTS[mask & four] == 3:
+                digits[mask] = 5
+            else:
+                digits[mask] = 2
+        elif mask & four == four:
+            digits[mask] = 9
+        elif mask & one == one:
+            digits[mask] = 0
+        else:
+            digits[mask] = 6
+    return digits
+
+
+def output_number(digits: dict[int, int], output_masks: list[int]) -> int:
+    number = 0
+    for mask in output_masks:
+        number = number * 10 + digits[mask]
+    return number
+
+
+def decode_output(entry: MaskEntry) -> int:
+    digits = mask_digits(entry.unique_masks)
+    return output_number(digits=digits, output_masks=entry.output_masks)
+
+
+def wiring_signature(masks: Iterable[int]) -> tuple[int, ...]:
+    # the ten patterns as a set are different for every one of the wirings
+    return tuple(sorted(masks))
+
+
+@dataclass
+class WiringTable:
+    # only persisted when given a file, which is reused once it checks out
+    filename: Optional[Path] = None
+    table: dict[tuple[int, ...], dict[int, int]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.filename is not None and self.filename.exists():
+            self.load()
+        if not self.is_complete():
+            self.table.clear()
+            self.build()
+            if self.filename is not None:
+                self.save()
+
+    def is_complete(self) -> bool:
+        return len(self.table) == WIRINGS and all(
+            sorted(digits.values()) == DIGITS for digits in self.table.values()
+        )
+
+    def build(self) -> None:
+        # picks the wire bits of the segments each digit lights up
+        digit_segments = [
+            itemgetter(*map(SEGMENTS.index, display.segments_on()))
+            for display in DISPLAYS
+        ]
+        for wires in permutations([1 << wire for wire in range(len(SEGMENTS))]):
+            wired = [sum(segments(wires)) for segments in digit_segments]
+            self.table[wiring_signature(wired)] = dict(zip(wired, DIGITS))
+
+    def load(self) -> None:
+        stored: dict[str, list[int]] = json.loads(self.filename.read_text())
+        for signature, digits in stored.items():
+            masks = tuple(map(int, signature.split(",")))
+            if len(masks) == len(digits) == len(DIGITS):
+                self.table[masks] = dict(zip(masks, digits))
+
+    def save(self) -> None:
+        stored = {
+            ",".join(map(str, signature)): [digits[mask] for mask in signature]
+            for signature, digits in self.table.items()
+        }
+        self.filename.write_text(json.dumps(stored))
+
+    def digits(self, unique_masks: Iterable[int]) -> dict[int, int]:
+        return self.table[wiring_signature(unique_masks)]
+
+    def decode(self, entry: MaskEntry) -> int:
+        digits = self.digits(entry.unique_masks)
+        return output_number(digits=digits, output_masks=entry.output_masks)
+
+
+@cache
+def wiring_table() -> WiringTable:
+    return WiringTable()
+
+
+def iter_mask_entrys(data: Iterator[str]) -> Iterator[MaskEntry]:
+    return map(parse_mask_entry, data)
+
+
+def count_unique_outputs(entry: MaskEntry) -> int:
+    counts = map(MASK_SEGMENT_COUNTS.__getitem__, entry.output_masks)
+    return sum(count in UNIQUE_SEGMENT_COUNTS for count in counts)
+
+
+class NoteTotals(NamedTuple):
+    unique_outputs: int = 0
+    output_sum: int = 0
+
+    def __add__(self, other: "NoteTotals") -> "NoteTotals":
+        return NoteTotals(
+            unique_outputs=self.unique_outputs + other.unique_outputs,
+            output_sum=self.output_sum + other.output_sum,
+        )
+
+
+@cache
+def byte_pattern_mask(pattern: bytes) -> int:
+    return pattern_mask(pattern.decode())
+
+
+def decode_note_lines(data: bytes) -> NoteTotals:
+    unique_outputs = output_sum = 0
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        unique_patterns, output_patterns = line.split(b"|")
+        unique_masks = list(map(byte_pattern_mask, unique_patterns.split()))
+        output_masks = list(map(byte_pattern_mask, output_patterns.split()))
+        unique_outputs += sum(
+            MASK_SEGMENT_COUNTS[mask] in UNIQUE_SEGMENT_COUNTS for mask in output_masks
+        )
+        output_sum += output_number(mask_digits(unique_masks), output_masks)
+    return NoteTotals(unique_outputs=unique_outputs, output_sum=output_sum)
+
+
+def decode_note_range(filename: str, start: int, end: int) -> NoteTotals:
+    with map_file(filename) as data:
+        return decode_note_lines(data[start:end])
+
+
+def note_ranges(filename: str, chunks: int) -> list[tuple[int, int]]:
+    # cut roughly equal byte ranges, then push every cut to the next line start
+    with map_file(filename) as data:
+        size = len(data)
+        cuts = [0]
+        for chunk in range(1, chunks):
+            cut = data.find(b"\n", max(size * chunk // chunks, cuts[-1])) + 1
+            if cut == 0:
+                break
+            cuts.append(cut)
+    cuts.append(size)
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if start < end]
+
+
+def iter_note_totals(
+    filename: str,
+    workers: Optional[int] = None,
+    chunks: Optional[int] = None,
+) -> Iterator[NoteTotals]:
+    workers = workers or os.cpu_count() or 1
+    ranges = note_ranges(filename, chunks=chunks or workers * CHUNKS_PER_WORKER)
+    if workers == 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            yield decode_note_range(filename, start, end)
+        return None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(decode_note_range, filename, start, end)
+            for start, end in ranges
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def decode_notes(
+    filename: str,
+    workers: Optional[int] = None,
+    chunks: Optional[int] = None,
+) -> NoteTotals:
+    return sum(iter_note_totals(filename, workers=workers, chunks=chunks), NoteTotals())
+
+
+def part_one(filename: str) -> int:
+    entrys = iter_mask_entrys(iter_data(filename))
+    return sum(map(count_unique_outputs, entrys))
+
+
+def part_two(filename: str) -> int:
+    wirings = wiring_table()
+    entrys = iter_mask_entrys(iter_data(filename))
+    return sum(map(wirings.decode, entrys))
 
 
 def main():
-    part_one(FILENAME)
-    part_two(FILENAME)
+    print(f"Part one: {part_one(FILENAME)}")
+    print(f"Part two: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
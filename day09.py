@@ -1,6 +1,8 @@
-from typing import Iterator, NamedTuple, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Union
 from dataclasses import dataclass, field
 
+from loader import read_digit_grid
+
 FILENAME = "day9_data.txt"
 
 
@@ -111,7 +113,7 @@ def get_low_height_risk_score(low_heights: list[Height]) -> int:
     return sum(height.value + 1 for height in low_heights)
 
 
-def get_heightmap(data: Iterator[str]) -> HeightMap:
+def get_heightmap(data: Iterable[Union[str, Sequence[int]]]) -> HeightMap:
     heightmap = HeightMap()
     for y, row in enumerate(data):
         heightmap_row: list[Height] = []
@@ -123,24 +125,24 @@ def get_heightmap(data: Iterator[str]) -> HeightMap:
     return heightmap
 
 
-def part_one(filename: str) -> None:
-    data = yield_data(filename)
+def part_one(filename: str) -> int:
+    data = read_digit_grid(filename).rows()
     heightmap = get_heightmap(data)
     low_heights = heightmap.get_low_heights()
-    print(f"Part one: {get_low_height_risk_score(low_heights)}")
+    return get_low_height_risk_score(low_heights)
 
 
-def part_two(filename: str) -> None:
-    data = yield_data(filename)
+def part_two(filename: str) -> int:
+    data = read_digit_grid(filename).rows()
     heightmap = get_heightmap(data)
     basins = heightmap.get_basins()
     basins.sort(key=len, reverse=True)
-    print(f"Part two: {len(basins[0]) * len(basins[1]) * len(basins[2])}")
+    return len(basins[0]) * len(basins[1]) * len(basins[2])
 
 
 def main():
-    part_one(FILENAME)
-    part_two(FILENAME)
+    print(f"Part one: {part_one(FILENAME)}")
+    print(f"Part two: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
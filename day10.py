@@ -132,7 +132,7 @@ def yield_data(filename: str) -> Iterator[str]:
             yield line.strip()
 
 
-def part_one(filename: str) -> None:
+def part_one(filename: str) -> int:
     points = 0
     data = yield_data(filename=filename)
     for line in data:
@@ -141,10 +141,10 @@ def part_one(filename: str) -> None:
         if corrupt_close_chunk:
             # print(corrupt_close_chunk)
             points += corrupt_close_chunk.syntax_error_points()
-    print(f"Part One: {points}")
+    return points
 
 
-def part_two(filename: str) -> None:
+def part_two(filename: str) -> int:
     points: list[int] = []
     data = yield_data(filename=filename)
     for line in data:
@@ -156,12 +156,12 @@ def part_two(filename: str) -> None:
         # print(completion_line)
         points.append(completion_line.completion_chunk_points())
     points.sort()
-    print(f"Part Two: {points[math.floor(len(points) / 2)]}")
+    return points[math.floor(len(points) / 2)]
 
 
 def main():
-    part_one(FILENAME)
-    part_two(FILENAME)
+    print(f"Part One: {part_one(FILENAME)}")
+    print(f"Part Two: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
-from typing import Iterator, NamedTuple, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Union
 from dataclasses import dataclass, field
 
+from loader import read_digit_grid
+
 
 FILENAME = "day11_data.txt"
 
@@ -131,7 +133,9 @@ class OctopusGrid:
         return "\n".join(rows)
 
 
-def create_octopuses(lines: Iterator[str]) -> list[list[Octopus]]:
+def create_octopuses(
+    lines: Iterable[Union[str, Sequence[int]]]
+) -> list[list[Octopus]]:
     octopuses: list[list[Octopus]] = []
     for y, line in enumerate(lines):
         octopus_row: list[Octopus] = []
@@ -143,19 +147,19 @@ def create_octopuses(lines: Iterator[str]) -> list[list[Octopus]]:
     return octopuses
 
 
-def part_one(filename: str) -> None:
-    data = iter_data(filename=filename)
+def part_one(filename: str) -> int:
+    data = read_digit_grid(filename).rows()
     octopuses = create_octopuses(lines=data)
     grid_size = GridSize(max_point=Point(x=len(octopuses[0]), y=len(octopuses)))
     octopus_grid = OctopusGrid(octopuses=octopuses, grid_size=grid_size)
     for step in range(1, 101):
         octopus_grid.step()
         octopus_grid.flash_step()
-    print(f"Total times flashed: {octopus_grid.total_times_octopuses_flashed()}")
+    return octopus_grid.total_times_octopuses_flashed()
 
 
-def part_two(filename: str) -> None:
-    data = iter_data(filename=filename)
+def part_two(filename: str) -> Optional[int]:
+    data = read_digit_grid(filename).rows()
     octopuses = create_octopuses(lines=data)
     grid_size = GridSize(max_point=Point(x=len(octopuses[0]), y=len(octopuses)))
     octopus_grid = OctopusGrid(octopuses=octopuses, grid_size=grid_size)
@@ -163,13 +167,13 @@ def part_two(filename: str) -> None:
         octopus_grid.step()
         octopus_grid.flash_step()
         if octopus_grid.all_octopuses_flashed():
-            print(f"All octopuses flashed at step {step}")
-            break
+            return step
+    return None
 
 
 def main():
-    part_one(FILENAME)
-    part_two(FILENAME)
+    print(f"Total times flashed: {part_one(FILENAME)}")
+    print(f"All octopuses flashed at step {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
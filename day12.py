@@ -6,9 +6,7 @@ from operator import attrgetter
 from collections import Counter
 
 
-FILENAME = (
-    r"C:\Users\Dave\Documents\VsWorkspace\advent_of_code\year2021\day12_data.txt"
-)
+FILENAME = "day12_data.txt"
 
 
 def iter_data(filename: str) -> Iterator[str]:
@@ -156,7 +154,7 @@ def distinct_paths2(start_cave: Cave) -> list[list[str]]:
     return paths
 
 
-def part_one(filename: str) -> None:
+def part_one(filename: str) -> Optional[int]:
     cave_system = create_cave_system(filename)
     # for cave in cave_system.caves.values():
     #     print(cave.connected_caves)
@@ -165,22 +163,24 @@ def part_one(filename: str) -> None:
         paths = distinct_paths(start_cave=start_cave)
         # for path in paths:
         #     print(path)
-        print(f"Part One: {len(paths)}")
+        return len(paths)
+    return None
 
 
-def part_two(filename: str) -> None:
+def part_two(filename: str) -> Optional[int]:
     cave_system = create_cave_system(filename)
     start_cave = cave_system.retrive_cave("start")
     if start_cave:
         paths = distinct_paths2(start_cave=start_cave)
         # for path in sorted(paths):
         #     print(path)
-        print(f"Part Two: {len(paths)}")
+        return len(paths)
+    return None
 
 
 def main():
-    part_one(FILENAME)
-    part_two(FILENAME)
+    print(f"Part One: {part_one(FILENAME)}")
+    print(f"Part Two: {part_two(FILENAME)}")
 
 
 if __name__ == "__main__":
@@ -174,7 +174,7 @@ def create_paper_config(data: Iterator[str]) -> PaperCofig:
     return paper_config
 
 
-def part_one(filename: str) -> None:
+def part_one(filename: str) -> int:
     data = iter_data(filename=filename)
     paper_config = create_paper_config(data=data)
     transparent_paper = TransparentPaper(
@@ -183,11 +183,11 @@ def part_one(filename: str) -> None:
     transparent_paper.add_dots(coordinates=paper_config.coordinates)
     for fold_instruction in paper_config.fold_instructions[:1]:
         transparent_paper = transparent_paper.fold(fold_instruction)
-    print(f"Part One: {transparent_paper.dot_count()}")
     # print(transparent_paper)
+    return transparent_paper.dot_count()
 
 
-def part_two(filename: str) -> None:
+def part_two(filename: str) -> str:
     data = iter_data(filename=filename)
     paper_config = create_paper_config(data=data)
     transparent_paper = TransparentPaper(
@@ -196,13 +196,13 @@ def part_two(filename: str) -> None:
     transparent_paper.add_dots(coordinates=paper_config.coordinates)
     for fold_instruction in paper_config.fold_instructions:
         transparent_paper = transparent_paper.fold(fold_instruction)
-    print("Part Two:")
-    print(transparent_paper)
+    return str(transparent_paper)
 
 
 def main():
-    # part_one(FILENAME)
-    part_two(FILENAME)
+    # print(f"Part One: {part_one(FILENAME)}")
+    print("Part Two:")
+    print(part_two(FILENAME))
 
 
 if __name__ == "__main__":
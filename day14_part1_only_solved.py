@@ -4,6 +4,8 @@ from collections import Counter
 from itertools import tee
 
 FILENAME = "day14_data.txt"
+# part_two is not solved yet
+PARTS = ("part_one",)
 
 
 def iter_data(filename: str) -> Iterator[str]:
@@ -61,13 +63,13 @@ def create_sub_optimal_polymer(data: Iterator[str]) -> SubOptimalPolymer:
     return polymer
 
 
-def part_one(filename: str) -> None:
+def part_one(filename: str) -> int:
     data = iter_data(filename=filename)
     sub_optimal_polymer = create_sub_optimal_polymer(data=data)
     for _ in range(10):
         sub_optimal_polymer.step()
     most, least = sub_optimal_polymer.most_and_least_common_count()
-    print(f"Part One: {most - least}")
+    return most - least
 
 
 def part_two(filename: str) -> None:
@@ -75,7 +77,7 @@ def part_two(filename: str) -> None:
 
 
 def main():
-    part_one(FILENAME)
+    print(f"Part One: {part_one(FILENAME)}")
     # part_two(FILENAME)
 
 
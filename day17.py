@@ -206,7 +206,7 @@ def test_part_one() -> None:
     return None
 
 
-def part_one() -> None:
+def part_one() -> Position:
     target_area = TargetArea(
         min_position=Position(x=102, y=-146), max_position=Position(x=157, y=-90)
     )
@@ -215,10 +215,9 @@ def part_one() -> None:
     for _ in range(350):
         probe_investigation.step()
     # print(probe_investigation)
-    print(probe_investigation.nearest_target_str())
-    print(probe_investigation.nearest_step_position_to_target_area())
-    print(f"Part One: {probe_investigation.max_position()=}")
-    return None
+    # print(probe_investigation.nearest_target_str())
+    # print(probe_investigation.nearest_step_position_to_target_area())
+    return probe_investigation.max_position()
 
 
 def test_part_two() -> None:
@@ -257,7 +256,7 @@ def test_part_two() -> None:
     return None
 
 
-def part_two() -> None:
+def part_two() -> int:
     target_area = TargetArea(
         min_position=Position(x=102, y=-146), max_position=Position(x=157, y=-90)
     )
@@ -292,15 +291,14 @@ def part_two() -> None:
                     velocities_in_target_area.append(velocity)
                     break
 
-    print(f"Part Two: {len(velocities_in_target_area)}")
-    return None
+    return len(velocities_in_target_area)
 
 
 def main():
     # test_part_one()
-    # part_one()
+    # print(f"Part One: {part_one()=}")
     # test_part_two()
-    part_two()
+    print(f"Part Two: {part_two()}")
 
 
 if __name__ == "__main__":
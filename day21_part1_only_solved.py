@@ -87,7 +87,7 @@ class Game:
         return pawn.score
 
 
-def part_one():
+def part_one() -> int:
     dice = DeterministicDice(sides=100)
     board = Board(amount_of_spaces=10)
     game = Game(dice=dice, board=board)
@@ -97,17 +97,17 @@ def part_one():
     while True:
         player = next(cycle_players)
         result = game.take_a_turn(player=player)
-        print(result)
+        # print(result)
         if game.player_score(player=player) >= 1000:
             break
     rolls = dice.roll_count
     player = next(cycle_players)
     player_score = game.player_score(player=player)
-    print(f"Part one: {player_score * rolls}")
+    return player_score * rolls
 
 
 def main():
-    part_one()
+    print(f"Part one: {part_one()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+import mmap
+import os
+from array import array
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional, Union
+
+
+DIGIT_TABLE = bytes.maketrans(b"0123456789", bytes(range(10)))
+WHITESPACE = b" \t\r\n"
+COMMA_TABLE = bytes.maketrans(b",", b" ")
+ARROW_TABLE = bytes.maketrans(b",->", b"   ")
+WINDOW_SIZE = 1 << 16
+
+Buffer = Union[mmap.mmap, bytes]
+
+
+class DigitGrid(NamedTuple):
+    width: int
+    height: int
+    values: bytearray
+
+    def rows(self) -> Iterator[memoryview]:
+        view = memoryview(self.values)
+        for y in range(self.height):
+            yield view[y * self.width : (y + 1) * self.width]
+
+    def value(self, x: int, y: int) -> int:
+        return self.values[y * self.width + x]
+
+
+@contextmanager
+def map_file(filename: str) -> Iterator[Buffer]:
+    with open(file=filename, mode="rb") as read_file:
+        if os.fstat(read_file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_windows(
+    data: Buffer,
+    separator: bytes = b"\n",
+    start: int = 0,
+    window_size: int = WINDOW_SIZE,
+) -> Iterator[bytes]:
+    # copy the data a window at a time, carrying whatever follows the last
+    # separator over to the next window so no token is ever cut in two
+    partial = b""
+    for window_start in range(start, len(data), window_size):
+        window = partial + data[window_start : window_start + window_size]
+        end = window.rfind(separator) + 1
+        partial = window[end:]
+        if end:
+            yield window[:end]
+    if partial:
+        yield partial
+
+
+def parse_integers(
+    data: Buffer,
+    separator: bytes = b"\n",
+    table: Optional[bytes] = None,
+    start: int = 0,
+) -> array:
+    numbers = array("q")
+    for window in iter_windows(data, separator=separator, start=start):
+        if table is not None:
+            window = window.translate(table)
+        numbers.extend(map(int, window.split()))
+    return numbers
+
+
+def read_integers(filename: str) -> array:
+    with map_file(filename) as data:
+        return parse_integers(data)
+
+
+def read_comma_integers(filename: str) -> array:
+    with map_file(filename) as data:
+        return parse_integers(data, separator=b",", table=COMMA_TABLE)
+
+
+def read_arrow_pairs(filename: str) -> array:
+    with map_file(filename) as data:
+        return parse_integers(data, table=ARROW_TABLE)
+
+
+def read_digit_grid(filename: str) -> DigitGrid:
+    values = bytearray()
+    with map_file(filename) as data:
+        line_end = data.find(b"\n")
+        width = len(data[: line_end if line_end >= 0 else len(data)].strip())
+        for window in iter_windows(data):
+            values += window.translate(DIGIT_TABLE, WHITESPACE)
+    if width == 0:
+        return DigitGrid(width=0, height=0, values=bytearray())
+    height, remainder = divmod(len(values), width)
+    if remainder:
+        raise ValueError(f"{filename} rows are not all {width} digits wide")
+    return DigitGrid(width=width, height=height, values=values)
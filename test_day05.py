@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from day05 import GridBackend, OceanFloor, Point, Vent
+
+
+BACKENDS = [backend for backend in GridBackend if backend != GridBackend.DENSE]
+FIELDS = 400
+FIELD_SIZE = 24
+SEED = 2021
+
+SAMPLE = [
+    ((0, 9), (5, 9)),
+    ((8, 0), (0, 8)),
+    ((9, 4), (3, 4)),
+    ((2, 2), (2, 1)),
+    ((7, 0), (7, 4)),
+    ((6, 4), (2, 0)),
+    ((0, 9), (2, 9)),
+    ((3, 4), (1, 4)),
+    ((0, 0), (8, 8)),
+    ((5, 5), (8, 2)),
+]
+SINGLE_POINTS = [((3, 3), (3, 3)), ((3, 3), (3, 3)), ((0, 3), (6, 3)), ((5, 5), (5, 5))]
+COLLINEAR = [
+    ((0, 0), (6, 0)),
+    ((4, 0), (9, 0)),
+    ((2, 1), (2, 7)),
+    ((2, 5), (2, 3)),
+    ((0, 2), (5, 7)),
+    ((7, 9), (3, 5)),
+    ((9, 0), (4, 5)),
+    ((6, 3), (8, 1)),
+]
+CROSSINGS = [
+    ((0, 0), (4, 4)),
+    ((0, 4), (4, 0)),
+    ((0, 0), (3, 3)),
+    ((0, 3), (3, 0)),
+    ((1, 0), (1, 6)),
+    ((0, 5), (6, 5)),
+]
+
+
+def create_vents(lines: list[tuple[tuple[int, int], tuple[int, int]]]) -> list[Vent]:
+    return [
+        Vent(start=Point(x=x1, y=y1), end=Point(x=x2, y=y2))
+        for (x1, y1), (x2, y2) in lines
+    ]
+
+
+def random_vent(rng: random.Random) -> Vent:
+    x, y = rng.randrange(FIELD_SIZE), rng.randrange(FIELD_SIZE)
+    dx, dy = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1), (0, 0)])
+    length = rng.randrange(FIELD_SIZE)
+    if dx:
+        length = min(length, FIELD_SIZE - 1 - x)
+    if dy > 0:
+        length = min(length, FIELD_SIZE - 1 - y)
+    if dy < 0:
+        length = min(length, y)
+    end = Point(x=x + dx * length, y=y + dy * length)
+    if rng.random() < 0.5:
+        return Vent(start=end, end=Point(x=x, y=y))
+    return Vent(start=Point(x=x, y=y), end=end)
+
+
+def overlap(vents: list[Vent], backend: GridBackend, **settings) -> int:
+    ocean_floor = OceanFloor(vents=vents, backend=backend, **settings)
+    ocean_floor.update_grid()
+    return ocean_floor.overlap()
+
+
+@pytest.mark.parametrize("backend", list(GridBackend))
+@pytest.mark.parametrize("angled, expected", [(False, 5), (True, 12)])
+def test_sample(backend: GridBackend, angled: bool, expected: int) -> None:
+    vents = [vent for vent in create_vents(SAMPLE) if angled or not vent.angled()]
+    assert overlap(vents, backend) == expected
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("lines", [SINGLE_POINTS, COLLINEAR, CROSSINGS])
+def test_matches_dense_grid(backend: GridBackend, lines: list) -> None:
+    vents = create_vents(lines)
+    assert overlap(vents, backend) == overlap(vents, GridBackend.DENSE)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_random_fields_match_dense_grid(backend: GridBackend) -> None:
+    rng = random.Random(SEED)
+    for _ in range(FIELDS):
+        vents = [random_vent(rng) for _ in range(rng.randrange(1, 30))]
+        expected = overlap(vents, GridBackend.DENSE)
+        assert overlap(vents, backend, tile_size=5, workers=1) == expected, vents
+
+
+@pytest.mark.parametrize("tile_size", [1, 3, 8, 100_000])
+def test_tiles_across_workers(tile_size: int) -> None:
+    rng = random.Random(SEED)
+    vents = create_vents(SAMPLE + COLLINEAR + CROSSINGS + SINGLE_POINTS)
+    vents += [random_vent(rng) for _ in range(50)]
+    expected = overlap(vents, GridBackend.DENSE)
+    tiled = overlap(vents, GridBackend.TILED, tile_size=tile_size, workers=2)
+    assert tiled == expected